@@ -1,18 +1,113 @@
 import pygame
 import random
+import csv
+import gc
+import json
 import math
+import multiprocessing
+import os
+from collections import OrderedDict, deque
+import numpy as np
+import struct
 import sys
 import time
+import zlib
 from enum import Enum
 
-# Pygame initialization
-pygame.init()
-pygame.mixer.init()
+# Pygame initialization: subsystems start on first use, so importing the module opens
+# no window, audio device or font scan
+STARTUP_TIME = time.perf_counter()
 
-# Screen setup
+def wall_ms():
+    # Milliseconds since the module loaded; animations use it in place of the SDL timer
+    return int((time.perf_counter() - STARTUP_TIME) * 1000)
+
+# Screen setup: the window is only opened by create_display, so the simulation can run headless.
+# Everything draws to screen, a fixed WIDTH x HEIGHT logical surface. When the window has another
+# size, present() scales that surface into it in one step, letterboxed to keep the aspect ratio.
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Galaxy Defender - Ultimate Space Shooter")
+SCALE_MODES = ("nearest", "smooth")
+screen = None
+window = None
+window_view = None
+present_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+scale_mode = "nearest"
+
+def create_display(size=None, fullscreen=False, scaling="nearest"):
+    global scale_mode
+    if window is None:
+        if scaling not in SCALE_MODES:
+            raise ValueError(f"unknown scaling {scaling!r}; choose from {', '.join(SCALE_MODES)}")
+        pygame.display.init()
+        pygame.display.set_caption("Galaxy Defender - Ultimate Space Shooter")
+        scale_mode = scaling
+        set_display_mode(size or (WIDTH, HEIGHT), fullscreen)
+    return screen
+
+def set_display_mode(size, fullscreen=False):
+    if fullscreen:
+        pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        pygame.display.set_mode(size, pygame.RESIZABLE)
+        if pygame.display.get_surface().get_size() != tuple(size):
+            # Some drivers keep the desktop size when leaving fullscreen; a fixed-size mode resets it
+            pygame.display.set_mode(size)
+            pygame.display.set_mode(size, pygame.RESIZABLE)
+    layout_display()
+
+def layout_display():
+    # Fits the logical surface into the current window; call again whenever the window changes size
+    global screen, window, window_view, present_rect
+    window = pygame.display.get_surface()
+    width, height = window.get_size()
+    if (width, height) == (WIDTH, HEIGHT):
+        # Native size: draw straight into the window, no scaling step
+        screen = window
+        window_view = None
+        present_rect = window.get_rect()
+        return
+    
+    scale = min(width / WIDTH, height / HEIGHT)
+    present_rect = pygame.Rect(0, 0, max(1, round(WIDTH * scale)), max(1, round(HEIGHT * scale)))
+    present_rect.center = (width // 2, height // 2)
+    if screen is None or screen is window or screen.get_size() != (WIDTH, HEIGHT):
+        screen = pygame.Surface((WIDTH, HEIGHT)).convert()
+    window.fill(BLACK)
+    window_view = window.subsurface(present_rect.clip(window.get_rect()))
+    pygame.display.flip()
+
+def present(dirty=None):
+    # Shows the frame; dirty lists the logical rects that changed, or is None for the whole frame
+    if window_view is None:
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+        return
+    if dirty is not None and not dirty:
+        return
+    if scale_mode == "smooth":
+        pygame.transform.smoothscale(screen, window_view.get_size(), window_view)
+    else:
+        pygame.transform.scale(screen, window_view.get_size(), window_view)
+    pygame.display.update(present_rect)
+
+def window_to_logical(pos):
+    x, y = pos
+    return (int((x - present_rect.x) * WIDTH / present_rect.width),
+            int((y - present_rect.y) * HEIGHT / present_rect.height))
+
+def create_offscreen_display():
+    # Render target for benchmarks and tooling when no window is wanted
+    global screen
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    return screen
+
+# Simulation timing: gameplay advances in fixed ticks, rendering interpolates between them
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5
+FRAME_RATE_CAP = 60
 
 # Colors
 BLACK = (0, 0, 0)
@@ -60,16 +155,657 @@ class WeaponType(Enum):
     SPREAD = 4
     LASER = 5
 
-# Load fonts
-title_font = pygame.font.SysFont('arial', 64, bold=True)
-menu_font = pygame.font.SysFont('arial', 36)
-game_font = pygame.font.SysFont('arial', 24)
-small_font = pygame.font.SysFont('arial', 18)
+# Per-tick player input, decoupled from the keyboard so the simulation can be driven by scripts
+class InputState:
+    __slots__ = ('left', 'right', 'up', 'down', 'fire')
+
+    def __init__(self, left=False, right=False, up=False, down=False, fire=False):
+        self.left = left
+        self.right = right
+        self.up = up
+        self.down = down
+        self.fire = fire
+
+    @classmethod
+    def from_keys(cls, keys):
+        return cls(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_UP], keys[pygame.K_DOWN], keys[pygame.K_SPACE])
+
+    @classmethod
+    def from_mask(cls, mask):
+        return INPUT_STATES[mask & 0x1F]
+
+    def mask(self):
+        return (bool(self.left) | bool(self.right) << 1 | bool(self.up) << 2
+                | bool(self.down) << 3 | bool(self.fire) << 4)
+
+INPUT_STATES = [InputState(bool(m & 1), bool(m & 2), bool(m & 4), bool(m & 8), bool(m & 16)) for m in range(32)]
+NO_INPUT = INPUT_STATES[0]
+
+# Seeded random streams, split by subsystem so cosmetic rolls never shift gameplay ones
+SEED_MASK = 2**64 - 1
+
+class GameRandom:
+    def __init__(self, seed=None):
+        self.sessions = random.Random(seed)
+        self.reseed(self.sessions.getrandbits(63))
+
+    def reseed(self, seed):
+        # Mission seeds are stored as unsigned 64-bit ints in replays and snapshots, so
+        # negative or oversized ones are folded into that range before anything is derived
+        seed &= SEED_MASK
+        self.seed = seed
+        self.waves = random.Random(f"{seed}:waves")
+        self.enemy_ai = random.Random(f"{seed}:enemy_ai")
+        self.loot = random.Random(f"{seed}:loot")
+        self.effects = np.random.default_rng(seed)
+
+    def next_session_seed(self):
+        return self.sessions.getrandbits(63)
+
+    def dump(self):
+        parts = [SNAPSHOT_SEED.pack(self.seed)]
+        for stream in (self.sessions, self.waves, self.enemy_ai, self.loot):
+            _, state, gauss = stream.getstate()
+            parts.append(RANDOM_STATE.pack(*state, gauss is not None, gauss or 0.0))
+        state = self.effects.bit_generator.state
+        parts.append(GENERATOR_STATE.pack(state["state"]["state"].to_bytes(16, "little"),
+                                          state["state"]["inc"].to_bytes(16, "little"),
+                                          bool(state["has_uint32"]), state["uinteger"]))
+        return b"".join(parts)
+
+    def load(self, data, offset):
+        # Streams are rewound in place, so everything holding one keeps a valid reference
+        self.seed, = SNAPSHOT_SEED.unpack_from(data, offset)
+        offset += SNAPSHOT_SEED.size
+        for stream in (self.sessions, self.waves, self.enemy_ai, self.loot):
+            *state, has_gauss, gauss = RANDOM_STATE.unpack_from(data, offset)
+            stream.setstate((stream.VERSION, tuple(state), gauss if has_gauss else None))
+            offset += RANDOM_STATE.size
+        state, inc, has_uint32, uinteger = GENERATOR_STATE.unpack_from(data, offset)
+        self.effects.bit_generator.state = {
+            "bit_generator": self.effects.bit_generator.state["bit_generator"],
+            "state": {"state": int.from_bytes(state, "little"), "inc": int.from_bytes(inc, "little")},
+            "has_uint32": int(has_uint32),
+            "uinteger": uinteger
+        }
+        return offset + GENERATOR_STATE.size
+
+unseeded_random = GameRandom()
+
+# Input replays: a header followed by run-length encoded per-tick input masks
+REPLAY_MAGIC = b"GDRP"
+REPLAY_VERSION = 3
+REPLAY_HEADER = struct.Struct("<4sHQII")
+REPLAY_RUN = struct.Struct("<BH")
+
+class InputRecorder:
+    def __init__(self, seed, budgets):
+        # Budgets decide which spawns are refused, so they are part of what a replay reproduces
+        self.seed = seed
+        self.budgets = budgets
+        self.masks = bytearray()
+
+    def __len__(self):
+        return len(self.masks)
+
+    def record(self, inputs):
+        self.masks.append(inputs.mask())
+
+    def save(self, path, digest=0):
+        masks = self.masks
+        runs = bytearray()
+        i = 0
+        while i < len(masks):
+            j = i + 1
+            while j < len(masks) and masks[j] == masks[i] and j - i < 0xFFFF:
+                j += 1
+            runs += REPLAY_RUN.pack(masks[i], j - i)
+            i = j
+        with open(path, "wb") as f:
+            f.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, len(masks), digest))
+            f.write(pack_budgets(self.budgets))
+            f.write(runs)
+
+class Replay:
+    def __init__(self, seed, masks, digest, budgets):
+        self.seed = seed
+        self.masks = masks
+        self.digest = digest
+        self.budgets = budgets
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, ticks, digest = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay")
+        budgets = unpack_budgets(data, REPLAY_HEADER.size)
+        masks = bytearray()
+        for mask, run in REPLAY_RUN.iter_unpack(data[REPLAY_HEADER.size + BUDGET_RECORD.size:]):
+            masks += bytes((mask,)) * run
+        if len(masks) != ticks:
+            raise ValueError(f"{path} is truncated: {len(masks)} of {ticks} ticks")
+        return cls(seed, masks, digest, budgets)
+
+    def pilot(self, game):
+        return INPUT_STATES[self.masks[game.tick]]
+
+    def play(self, game):
+        # Re-simulates the mission headless; returns (ticks run, final state matches the recording)
+        game.set_budgets(self.budgets)
+        game.start_mission(self.seed)
+        ticks = game.simulate(len(self.masks), self.pilot)
+        return ticks, game.state_digest() == self.digest
+
+# Snapshots: the whole simulation as fixed-layout records followed by raw component columns.
+# Restoring rebuilds every live object, so a snapshot is a save game, a checkpoint or a rewind point.
+SNAPSHOT_MAGIC = b"GDSS"
+SNAPSHOT_VERSION = 4
+SNAPSHOT_HEADER = struct.Struct("<4sH")
+SNAPSHOT_COUNT = struct.Struct("<I")
+SNAPSHOT_SEED = struct.Struct("<Q")
+RANDOM_STATE = struct.Struct("<625I?d")
+GENERATOR_STATE = struct.Struct("<16s16s?I")
+SNAPSHOT_ENUMS = {"state": GameState, "weapon_type": WeaponType, "type": EnemyType}
+
+class SnapshotRecord:
+    # Packs named attributes into one struct. Enums travel as their values, fields with a
+    # repeat count ("3B") as tuples, and attributes an object lacks as 0.
+    def __init__(self, *fields):
+        self.fields = [(name, int(code[:-1]) if len(code) > 1 else 0) for name, code in fields]
+        self.struct = struct.Struct("<" + "".join(code for _, code in fields))
+
+    def pack(self, obj):
+        values = []
+        for name, repeat in self.fields:
+            value = getattr(obj, name, 0)
+            if repeat:
+                values.extend(value)
+            else:
+                values.append(value.value if isinstance(value, Enum) else value)
+        return self.struct.pack(*values)
+
+    def unpack_into(self, obj, data, offset):
+        values = iter(self.struct.unpack_from(data, offset))
+        for name, repeat in self.fields:
+            if repeat:
+                value = tuple(next(values) for _ in range(repeat))
+            else:
+                value = next(values)
+                enum = SNAPSHOT_ENUMS.get(name)
+                if enum is not None:
+                    value = enum(value)
+            setattr(obj, name, value)
+        return offset + self.struct.size
+
+GAME_SNAPSHOT = SnapshotRecord(
+    ("state", "B"), ("tick", "q"), ("time_ms", "d"), ("enemy_spawn_timer", "q"), ("level", "q"), ("score", "q"),
+    ("boss_active", "?"), ("level_transition_timer", "q"), ("enemies_killed_this_level", "q"),
+    ("enemies_needed_for_boss", "q"), ("wave", "q"), ("wave_size", "q"), ("wave_enemies_spawned", "q"),
+    ("wave_complete", "?"), ("difficulty_timer", "d"), ("difficulty_interval", "q"))
+PLAYER_SNAPSHOT = SnapshotRecord(
+    ("x", "d"), ("y", "d"), ("prev_x", "d"), ("prev_y", "d"), ("speed", "d"), ("health", "q"), ("max_health", "q"),
+    ("score", "q"), ("lives", "q"), ("shoot_delay", "q"), ("last_shot", "d"), ("weapon_level", "q"),
+    ("weapon_type", "B"), ("power_timer", "d"), ("shield", "q"), ("money", "q"), ("kill_count", "q"),
+    ("invincible", "q"))
+# Position, speed and health live in the enemy archetype's columns; the rest is per object
+ENEMY_SNAPSHOT = SnapshotRecord(
+    ("type", "B"), ("level", "q"), ("width", "q"), ("height", "q"), ("max_health", "q"), ("value", "q"),
+    ("shoot_chance", "d"), ("color", "3B"), ("secondary_color", "3B"), ("attack_pattern", "q"),
+    ("attack_timer", "q"), ("movement_timer", "q"), ("hit_effect", "q"), ("last_shot", "d"), ("engine_pulse", "d"))
+# Tuning travels with the state so a restored game spawns and prices exactly as the saved one
+BALANCE_SNAPSHOT = SnapshotRecord(
+    ("level_scale", "d"), ("speed", "d"), ("health", "d"), ("shoot_chance", "d"), ("value", "d"),
+    ("shooter_roll", "d"), ("tank_roll", "d"), ("fast_roll", "d"), ("basic_roll", "d"))
+PARTICLE_SNAPSHOT = struct.Struct("<IQI")
+
+def interpolate(entity, alpha):
+    # Render position between the previous and current tick
+    return (entity.prev_x + (entity.x - entity.prev_x) * alpha,
+            entity.prev_y + (entity.y - entity.prev_y) * alpha)
+
+# Fonts: opened on first render. SysFont scans every installed font, so the file each
+# lookup resolves to is kept in an on-disk cache and later runs skip the scan.
+FONT_CACHE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                               "galaxy-defender", "fonts.json")
+
+class FontCache:
+    def __init__(self, path=FONT_CACHE_PATH):
+        self.path = path
+        self.paths = None
+        self.fonts = {}
+        self.scans = 0
+
+    def lookup(self, name, bold):
+        # [font file or None for pygame's default font, whether bold has to be synthesized]
+        if self.paths is None:
+            try:
+                with open(self.path) as f:
+                    self.paths = json.load(f)
+            except (OSError, ValueError):
+                self.paths = {}
+        key = f"{name}:{'bold' if bold else 'regular'}"
+        entry = self.paths.get(key)
+        if entry is None or (entry[0] is not None and not os.path.exists(entry[0])):
+            self.scans += 1
+            path = pygame.font.match_font(name, bold=bold)
+            entry = self.paths[key] = [path, bold and (path is None or path == pygame.font.match_font(name))]
+            self.save()
+        return entry
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self.paths, f, indent=2, sort_keys=True)
+        except OSError:
+            pass
+
+    def load(self, name, size, bold=False):
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            path, embolden = self.lookup(name, bold)
+            font = self.fonts[key] = pygame.font.Font(path, size)
+            if embolden:
+                font.set_bold(True)
+        return font
+
+font_cache = FontCache()
+
+class LazyFont:
+    def __init__(self, name, size, bold=False):
+        self.name = name
+        self.size = size
+        self.bold = bold
+
+    def __getattr__(self, attr):
+        # Only reached for the pygame.font.Font API, which loads the real font
+        return getattr(font_cache.load(self.name, self.size, self.bold), attr)
+
+title_font = LazyFont('arial', 64, bold=True)
+menu_font = LazyFont('arial', 36)
+game_font = LazyFont('arial', 24)
+small_font = LazyFont('arial', 18)
+tiny_font = LazyFont('arial', 13)
+
+# Text rendering caches
+TEXT_CACHE_SIZE = 256
+
+class TextCache:
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+text_cache = TextCache()
+
+# HUD label that only re-renders when its text changes
+class TextLabel:
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.text = None
+        self.surface = None
+
+    def render(self, text):
+        if text != self.text:
+            self.text = text
+            self.surface = self.font.render(text, True, self.color)
+        return self.surface
+
+# Overlay surface cache: translucent fills and shapes are built once and handed out ready to blit
+class SurfaceCache:
+    def __init__(self):
+        self.surfaces = {}
+        self.hits = 0
+        self.misses = 0
+
+    def convert(self, surface, alpha):
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def fill(self, size, color):
+        # Uniform fills use surface-level alpha, so one opaque surface serves every alpha value
+        rgb = tuple(color[:3])
+        key = ("fill", size, rgb)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = pygame.Surface(size)
+            surface.fill(rgb)
+            surface = self.surfaces[key] = self.convert(surface, False)
+        else:
+            self.hits += 1
+        surface.set_alpha(color[3] if len(color) > 3 else None)
+        return surface
+
+    def shape(self, key, size, draw):
+        # Per-pixel alpha surfaces painted once by draw(surface)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            draw(surface)
+            surface = self.surfaces[key] = self.convert(surface, True)
+        else:
+            self.hits += 1
+        return surface
+
+surface_cache = SurfaceCache()
+
+# Quality governor: steps cosmetic detail down while measured frame time runs over budget and
+# back up once there is headroom again. Gameplay never depends on the tier.
+QUALITY_TIERS = (
+    {"name": "high", "particles": 1.0, "trail": 1.0, "glow": True, "stars": 1.0},
+    {"name": "medium", "particles": 0.5, "trail": 0.6, "glow": True, "stars": 0.6},
+    {"name": "low", "particles": 0.25, "trail": 0.0, "glow": False, "stars": 0.3}
+)
+QUALITY_WINDOW = 30
+QUALITY_DEGRADE_AT = 0.9
+QUALITY_RESTORE_AT = 0.5
+QUALITY_RESTORE_FRAMES = 180
+QUALITY_COOLDOWN = 60
+
+class QualityGovernor:
+    def __init__(self, budget_ms=1000 / FRAME_RATE_CAP, tiers=QUALITY_TIERS):
+        self.budget_ms = budget_ms
+        self.tiers = tiers
+        self.tier = 0
+        self.settings = tiers[0]
+        self.auto = True
+        self.samples = np.zeros(QUALITY_WINDOW)
+        self.frames = 0
+        self.cooldown = 0
+        self.calm = 0
+        # Recent tier changes only, so a long session holds a bounded log
+        self.history = deque(maxlen=QUALITY_WINDOW)
+
+    def observe(self, frame_ms):
+        # Feeds one frame's work time; returns True when the tier changed
+        self.samples[self.frames % QUALITY_WINDOW] = frame_ms
+        self.frames += 1
+        if not self.auto or self.frames < QUALITY_WINDOW:
+            return False
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return False
+        
+        mean = float(self.samples.mean())
+        if mean > self.budget_ms * QUALITY_DEGRADE_AT and self.tier < len(self.tiers) - 1:
+            self.set_tier(self.tier + 1, mean)
+            return True
+        if mean < self.budget_ms * QUALITY_RESTORE_AT and self.tier > 0:
+            # Only sustained headroom steps back up, so the tier does not oscillate
+            self.calm += 1
+            if self.calm >= QUALITY_RESTORE_FRAMES:
+                self.set_tier(self.tier - 1, mean)
+                return True
+        else:
+            self.calm = 0
+        return False
+
+    def set_tier(self, tier, frame_ms=None):
+        self.tier = tier
+        self.settings = self.tiers[tier]
+        self.cooldown = QUALITY_COOLDOWN
+        self.calm = 0
+        self.history.append({
+            "frame": self.frames,
+            "tier": tier,
+            "name": self.settings["name"],
+            "frame_ms": None if frame_ms is None else round(frame_ms, 3)
+        })
+
+    def pin(self, tier):
+        # Fixes the tier and stops adapting; pin(None) hands control back to the governor
+        self.auto = tier is None
+        if tier is not None and tier != self.tier:
+            self.set_tier(tier)
+
+    def stats(self):
+        return {
+            "tier": self.tier,
+            "name": self.settings["name"],
+            "auto": self.auto,
+            "frame_ms": round(float(self.samples[:min(self.frames, QUALITY_WINDOW)].mean()), 3) if self.frames else 0.0,
+            "history": list(self.history)
+        }
+
+quality = QualityGovernor()
+
+# Frame profiler: consecutive laps charge every slice of a frame to one phase, so the
+# phases add up to the whole frame. Laps return at once while the profiler is off.
+PROFILE_PHASES = (
+    "events",
+    "update.player", "update.spawning", "update.projectiles", "update.enemies",
+    "update.power_ups", "update.particles", "update.collisions",
+    "draw.background", "draw.particles", "draw.enemies", "draw.bullets",
+    "draw.enemy_bullets", "draw.power_ups", "draw.player", "draw.hud",
+    "draw.screen", "draw.profiler",
+    "present", "idle"
+)
+PROFILE_COUNTS = ("enemies", "bullets", "enemy_bullets", "power_ups", "particles", "shed")
+PROFILE_WINDOW = 120
+PROFILE_REFRESH = 15
+PROFILE_LINE_HEIGHT = 15
+PROFILE_GRAPH_HEIGHT = 60
+PROFILE_PANEL_WIDTH = 250
+PROFILE_PANEL_HEIGHT = (len(PROFILE_PHASES) + 5) * PROFILE_LINE_HEIGHT + PROFILE_GRAPH_HEIGHT + 24
+PROFILE_BUDGET_MS = 1000 / FRAME_RATE_CAP
+
+class FrameProfiler:
+    def __init__(self, window=PROFILE_WINDOW):
+        self.enabled = False
+        self.phase_index = {phase: i for i, phase in enumerate(PROFILE_PHASES)}
+        self.current = np.zeros(len(PROFILE_PHASES))
+        self.history = np.zeros((window, len(PROFILE_PHASES)))
+        self.frame_history = np.zeros(window)
+        self.count_history = np.zeros((window, len(PROFILE_COUNTS)), np.int64)
+        self.reuse = {}
+        self.frames = 0
+        self.records = None
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.panel = None
+        self.panel_frame = 0
+
+    def set_enabled(self, enabled):
+        enabled = enabled or self.records is not None
+        if enabled and not self.enabled:
+            self.current.fill(0)
+            self.frame_start = self.last = time.perf_counter()
+        self.enabled = enabled
+
+    def record(self):
+        # Keeps every frame from now on for export, not just the rolling window
+        if self.records is None:
+            self.records = []
+        self.set_enabled(True)
+
+    def begin_frame(self):
+        if self.enabled:
+            self.current.fill(0)
+            self.frame_start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        # Charges the time since the previous lap to phase
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[self.phase_index[phase]] += now - self.last
+            self.last = now
+
+    def end_frame(self, counts, reuse=None):
+        # reuse maps a projectile archetype to the share of its spawns served without growing
+        if not self.enabled:
+            return
+        if reuse is not None:
+            self.reuse = reuse
+        slot = self.frames % len(self.frame_history)
+        self.history[slot] = self.current * 1000
+        self.frame_history[slot] = (self.last - self.frame_start) * 1000
+        self.count_history[slot] = [counts[name] for name in PROFILE_COUNTS]
+        if self.records is not None:
+            self.records.append(self.row(slot, self.frames))
+        self.frames += 1
+
+    def row(self, slot, frame):
+        return ([frame, round(float(self.frame_history[slot]), 4)]
+                + [round(ms, 4) for ms in self.history[slot].tolist()]
+                + self.count_history[slot].tolist())
+
+    def window_slots(self):
+        # Ring slots of the rolling window, oldest first
+        window = len(self.frame_history)
+        n = min(self.frames, window)
+        return np.arange(self.frames - n, self.frames) % window
+
+    def averages(self):
+        slots = self.window_slots()
+        if len(slots) == 0:
+            return dict.fromkeys(PROFILE_PHASES, 0.0)
+        return dict(zip(PROFILE_PHASES, self.history[slots].mean(axis=0).tolist()))
+
+    def summary(self):
+        slots = self.window_slots()
+        if len(slots) == 0:
+            slots = np.zeros(1, np.intp)
+        frame_ms = self.frame_history[slots]
+        idle = self.history[slots, self.phase_index["idle"]]
+        return {
+            "frames": self.frames,
+            "window": len(slots),
+            "frame_ms": {
+                "mean": round(float(frame_ms.mean()), 4),
+                "p95": round(float(np.percentile(frame_ms, 95)), 4),
+                "max": round(float(frame_ms.max()), 4)
+            },
+            "work_ms": round(float((frame_ms - idle).mean()), 4),
+            "phases_ms": {phase: round(ms, 4) for phase, ms in self.averages().items()},
+            "counts": dict(zip(PROFILE_COUNTS, self.count_history[slots[-1]].tolist())),
+            "reuse_rate": {name: round(rate, 4) for name, rate in self.reuse.items()}
+        }
+
+    def export(self, path):
+        # Every recorded frame, or the rolling window when nothing was recorded; .csv or JSON by extension
+        if self.records is not None:
+            rows = self.records
+        else:
+            slots = self.window_slots().tolist()
+            rows = [self.row(slot, self.frames - len(slots) + i) for i, slot in enumerate(slots)]
+        columns = ["frame", "frame_ms"] + [f"{phase}_ms" for phase in PROFILE_PHASES] + list(PROFILE_COUNTS)
+        with open(path, "w", newline="") as f:
+            if path.endswith(".csv"):
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(rows)
+            else:
+                json.dump({
+                    "summary": self.summary(),
+                    "columns": columns,
+                    "frames": rows
+                }, f, indent=2)
+                f.write("\n")
+        return len(rows)
+
+    def render_panel(self):
+        averages = self.averages()
+        summary = self.summary()
+        panel = pygame.Surface((PROFILE_PANEL_WIDTH, PROFILE_PANEL_HEIGHT))
+        panel.fill((10, 10, 25))
+        pygame.draw.rect(panel, CYAN, panel.get_rect(), 1)
+        
+        right = PROFILE_PANEL_WIDTH - 8
+        def line(y, label, value, color=WHITE):
+            text = text_cache.render(tiny_font, label, True, color)
+            panel.blit(text, (8, y))
+            if value:
+                text = text_cache.render(tiny_font, value, True, color)
+                panel.blit(text, (right - text.get_width(), y))
+        
+        frame_ms = summary["frame_ms"]
+        y = 6
+        line(y, f"FRAME {frame_ms['mean']:.2f} ms", f"p95 {frame_ms['p95']:.2f}  max {frame_ms['max']:.2f}", YELLOW)
+        y += PROFILE_LINE_HEIGHT
+        line(y, f"WORK {summary['work_ms']:.2f} ms", f"{1000 / max(frame_ms['mean'], 1e-6):.0f} FPS  "
+                f"{quality.settings['name'].upper()}", YELLOW)
+        y += PROFILE_LINE_HEIGHT
+        for phase in PROFILE_PHASES:
+            line(y, phase, f"{averages[phase]:.3f}", GREEN if phase.startswith("update") else
+                 CYAN if phase.startswith("draw") else WHITE)
+            y += PROFILE_LINE_HEIGHT
+        
+        counts = summary["counts"]
+        line(y, f"ENEMIES {counts['enemies']}  BULLETS {counts['bullets']}", f"SHED {counts['shed']}",
+             RED if counts["shed"] else ORANGE)
+        y += PROFILE_LINE_HEIGHT
+        line(y, f"ENEMY SHOTS {counts['enemy_bullets']}  DROPS {counts['power_ups']}  "
+                f"PARTICLES {counts['particles']}", None, ORANGE)
+        y += PROFILE_LINE_HEIGHT
+        reuse = summary["reuse_rate"]
+        if reuse:
+            line(y, f"REUSE  BULLETS {reuse['bullets']:.1%}  ENEMY SHOTS {reuse['enemy_bullets']:.1%}", None, ORANGE)
+        return panel
+
+    def draw(self, surface):
+        # The text panel refreshes a few times a second; the frame-time graph is redrawn every frame
+        if self.panel is None or self.frames - self.panel_frame >= PROFILE_REFRESH:
+            self.panel = self.render_panel()
+            self.panel_frame = self.frames
+        x, y = WIDTH - PROFILE_PANEL_WIDTH - 10, 75
+        area = surface.blit(self.panel, (x, y))
+        
+        graph = pygame.Rect(x + 8, y + PROFILE_PANEL_HEIGHT - PROFILE_GRAPH_HEIGHT - 8,
+                            PROFILE_PANEL_WIDTH - 16, PROFILE_GRAPH_HEIGHT)
+        pygame.draw.rect(surface, (30, 30, 50), graph)
+        scale = PROFILE_GRAPH_HEIGHT / (2 * PROFILE_BUDGET_MS)
+        budget_y = graph.bottom - PROFILE_BUDGET_MS * scale
+        pygame.draw.line(surface, RED, (graph.left, budget_y), (graph.right - 1, budget_y))
+        
+        slots = self.window_slots()
+        if len(slots) > 1:
+            xs = graph.left + np.arange(len(slots)) * (graph.width - 1) / (len(self.frame_history) - 1)
+            for values, color in ((self.frame_history[slots], (120, 120, 140)),
+                                  (self.frame_history[slots] - self.history[slots, self.phase_index["idle"]], GREEN)):
+                ys = graph.bottom - 1 - np.minimum(values * scale, PROFILE_GRAPH_HEIGHT - 1)
+                pygame.draw.lines(surface, color, False, np.column_stack((xs, ys)).tolist())
+        return area
 
 # Sound Manager
 class SoundManager:
     def __init__(self):
         self.sounds_enabled = True
+        self.mixer_ready = None
+
+    def init_mixer(self):
+        # Opens the audio device on first use; without one the game stays silent
+        if self.mixer_ready is None:
+            try:
+                pygame.mixer.init()
+                self.mixer_ready = True
+            except pygame.error:
+                self.mixer_ready = False
+        return self.mixer_ready
         
     def toggle_sounds(self):
         self.sounds_enabled = not self.sounds_enabled
@@ -86,17 +822,21 @@ class Button:
         self.icon = icon
         self.glow = 0
         self.glow_dir = 1
+        self.drawn = None
+        self.drawn_rect = self.rect.inflate(10, 10)
         
     def draw(self, surface):
+        self.drawn = (self.is_hovered, self.text)
         self.glow += 0.1 * self.glow_dir
         if self.glow > 5 or self.glow < 0:
             self.glow_dir *= -1
         
         color = self.hover_color if self.is_hovered else self.color
         
-        if self.is_hovered:
-            glow_surf = pygame.Surface((self.rect.width + 10, self.rect.height + 10), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surf, (*color, 100), glow_surf.get_rect(), border_radius=15)
+        if self.is_hovered and quality.settings["glow"]:
+            size = (self.rect.width + 10, self.rect.height + 10)
+            glow_surf = surface_cache.shape(("button_glow", size, color), size,
+                                            lambda glow: pygame.draw.rect(glow, (*color, 100), glow.get_rect(), border_radius=15))
             surface.blit(glow_surf, (self.rect.x - 5, self.rect.y - 5))
         
         pygame.draw.rect(surface, color, self.rect, border_radius=10)
@@ -104,14 +844,20 @@ class Button:
         border_color = WHITE if self.is_hovered else LIGHT_BLUE
         pygame.draw.rect(surface, border_color, self.rect, 3, border_radius=10)
         
-        text_surf = menu_font.render(self.text, True, WHITE)
+        text_surf = text_cache.render(menu_font, self.text, True, WHITE)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
+        # Labels can overhang the button, so record everything that was painted
+        self.drawn_rect = self.rect.inflate(10, 10).union(text_rect)
         
         if self.icon:
             icon_rect = self.icon.get_rect(midright=(self.rect.centerx - text_surf.get_width()//2 - 10, self.rect.centery))
             surface.blit(self.icon, icon_rect)
+            self.drawn_rect.union_ip(icon_rect)
         
+    def is_dirty(self):
+        return self.drawn != (self.is_hovered, self.text)
+
     def check_hover(self, pos):
         self.is_hovered = self.rect.collidepoint(pos)
         return self.is_hovered
@@ -120,12 +866,16 @@ class Button:
         return self.rect.collidepoint(pos) and click
 
 # Player class
+SPREAD_ANGLES = (-15, 0, 15)
+DOUBLE_BARRELS = (-10, 10)
+TRIPLE_BARRELS = (-15, 0, 15)
+
 class Player:
     def __init__(self):
         self.width = 50
         self.height = 30
-        self.x = WIDTH // 2
-        self.y = HEIGHT - 100
+        self.x = self.prev_x = WIDTH // 2
+        self.y = self.prev_y = HEIGHT - 100
         self.speed = 5
         self.color = GREEN
         self.health = 100
@@ -148,85 +898,93 @@ class Player:
         }
         self.invincible = 0
 
-    def draw(self):
+    def draw(self, alpha=1.0):
+        x, y = interpolate(self, alpha)
         pulse = 0
         if self.invincible > 0:
-            pulse = math.sin(pygame.time.get_ticks() * 0.01) * 10
+            pulse = math.sin(wall_ms() * 0.01) * 10
             
         # Main ship body
         pygame.draw.polygon(screen, self.color, [
-            (self.x, self.y - self.height//2 - pulse),
-            (self.x - self.width//2, self.y + self.height//2),
-            (self.x + self.width//2, self.y + self.height//2)
+            (x, y - self.height//2 - pulse),
+            (x - self.width//2, y + self.height//2),
+            (x + self.width//2, y + self.height//2)
         ])
         
         # Cockpit
-        pygame.draw.circle(screen, LIGHT_BLUE, (self.x, self.y - 5), 8)
+        pygame.draw.circle(screen, LIGHT_BLUE, (x, y - 5), 8)
         
         # Engine fire effect
         fire_height = random.randint(10, 20)
         pygame.draw.polygon(screen, YELLOW, [
-            (self.x - 8, self.y + self.height//2),
-            (self.x, self.y + self.height//2 + fire_height),
-            (self.x + 8, self.y + self.height//2)
+            (x - 8, y + self.height//2),
+            (x, y + self.height//2 + fire_height),
+            (x + 8, y + self.height//2)
         ])
         
         # Wings
         pygame.draw.polygon(screen, BLUE, [
-            (self.x - self.width//2, self.y + self.height//2),
-            (self.x - self.width//2 - 10, self.y),
-            (self.x - self.width//2, self.y - 5)
+            (x - self.width//2, y + self.height//2),
+            (x - self.width//2 - 10, y),
+            (x - self.width//2, y - 5)
         ])
         pygame.draw.polygon(screen, BLUE, [
-            (self.x + self.width//2, self.y + self.height//2),
-            (self.x + self.width//2 + 10, self.y),
-            (self.x + self.width//2, self.y - 5)
+            (x + self.width//2, y + self.height//2),
+            (x + self.width//2 + 10, y),
+            (x + self.width//2, y - 5)
         ])
         
         if self.shield > 0:
-            shield_radius = 30 + int(5 * math.sin(pygame.time.get_ticks() * 0.01))
-            shield_surf = pygame.Surface((shield_radius*2, shield_radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(shield_surf, (0, 100, 255, 100), (shield_radius, shield_radius), shield_radius)
-            pygame.draw.circle(shield_surf, (255, 255, 255, 150), (shield_radius, shield_radius), shield_radius, 2)
-            screen.blit(shield_surf, (self.x - shield_radius, self.y - shield_radius))
+            shield_radius = 30 + int(5 * math.sin(wall_ms() * 0.01))
+            if quality.settings["glow"]:
+                shield_surf = surface_cache.shape(("shield", shield_radius), (shield_radius*2, shield_radius*2),
+                                                  lambda shield: self.draw_shield(shield, shield_radius))
+                screen.blit(shield_surf, (x - shield_radius, y - shield_radius))
+            else:
+                pygame.draw.circle(screen, (0, 100, 255), (x, y), shield_radius, 2)
+
+    def draw_shield(self, surface, radius):
+        pygame.draw.circle(surface, (0, 100, 255, 100), (radius, radius), radius)
+        pygame.draw.circle(surface, (255, 255, 255, 150), (radius, radius), radius, 2)
 
-    def move(self, keys):
+    def move(self, inputs):
+        self.prev_x, self.prev_y = self.x, self.y
         speed = self.speed + (self.upgrades["speed"] * 0.5)
-        if keys[pygame.K_LEFT] and self.x > self.width//2:
+        if inputs.left and self.x > self.width//2:
             self.x -= speed
-        if keys[pygame.K_RIGHT] and self.x < WIDTH - self.width//2:
+        if inputs.right and self.x < WIDTH - self.width//2:
             self.x += speed
-        if keys[pygame.K_UP] and self.y > self.height//2:
+        if inputs.up and self.y > self.height//2:
             self.y -= speed
-        if keys[pygame.K_DOWN] and self.y < HEIGHT - self.height//2:
+        if inputs.down and self.y < HEIGHT - self.height//2:
             self.y += speed
             
         if self.invincible > 0:
             self.invincible -= 1
 
-    def shoot(self, bullets):
-        current_time = pygame.time.get_ticks()
+    def shoot(self, bullets, current_time):
         actual_delay = max(50, self.shoot_delay - (self.upgrades["fire_rate"] * 20))
         
         if current_time - self.last_shot > actual_delay:
             damage = 1 + self.upgrades["damage"]
+            muzzle = self.y - self.height//2
             
+            # Each volley is one spawn, so the bullet budget takes or refuses it whole
+            fired = None
             if self.weapon_type == WeaponType.SINGLE:
-                bullets.append(Bullet(self.x, self.y - self.height//2, damage))
+                fired = bullets.fire_bullet(self.x, muzzle, damage)
             elif self.weapon_type == WeaponType.DOUBLE:
-                bullets.append(Bullet(self.x - 10, self.y - self.height//2, damage))
-                bullets.append(Bullet(self.x + 10, self.y - self.height//2, damage))
+                fired = bullets.fire_bullet(self.x, muzzle, damage, barrels=DOUBLE_BARRELS)
             elif self.weapon_type == WeaponType.TRIPLE:
-                bullets.append(Bullet(self.x - 15, self.y - self.height//2, damage))
-                bullets.append(Bullet(self.x, self.y - self.height//2, damage))
-                bullets.append(Bullet(self.x + 15, self.y - self.height//2, damage))
+                fired = bullets.fire_bullet(self.x, muzzle, damage, barrels=TRIPLE_BARRELS)
             elif self.weapon_type == WeaponType.SPREAD:
-                bullets.append(Bullet(self.x, self.y - self.height//2, damage, angle=-15))
-                bullets.append(Bullet(self.x, self.y - self.height//2, damage, angle=0))
-                bullets.append(Bullet(self.x, self.y - self.height//2, damage, angle=15))
+                fired = bullets.fire_bullet(self.x, muzzle, damage, SPREAD_ANGLES)
             elif self.weapon_type == WeaponType.LASER:
-                bullets.append(LaserBeam(self.x, self.y - self.height//2, damage))
+                fired = bullets.fire_laser(self.x, muzzle, damage)
             
+            # A refused volley does not start the cooldown
+            if fired is None:
+                return False
             self.last_shot = current_time
             return True
         return False
@@ -244,77 +1002,405 @@ class Player:
             self.health -= amount
             self.invincible = 60
 
-# ADD THE MISSING BULLET CLASS HERE
-class Bullet:
-    def __init__(self, x, y, damage=1, angle=0):
-        self.x = x
-        self.y = y
-        self.radius = 4
-        self.speed = 7
-        self.damage = damage
-        self.angle = angle
-        self.color = YELLOW if damage == 1 else ORANGE if damage == 2 else RED
-        self.trail = []
-
-    def draw(self):
-        for i, (trail_x, trail_y) in enumerate(self.trail):
-            alpha = 255 - (i * 30)
-            if alpha > 0:
-                trail_surf = pygame.Surface((self.radius*2, self.radius*2), pygame.SRCALPHA)
-                pygame.draw.circle(trail_surf, (*self.color, alpha), (self.radius, self.radius), self.radius)
-                screen.blit(trail_surf, (trail_x - self.radius, trail_y - self.radius))
-        
-        pygame.draw.circle(screen, self.color, (self.x, self.y), self.radius)
-        pygame.draw.circle(screen, WHITE, (self.x, self.y), self.radius - 1)
-
-    def update(self):
-        self.trail.append((self.x, self.y))
-        if len(self.trail) > 5:
-            self.trail.pop(0)
-        
-        rad_angle = math.radians(self.angle)
-        self.x += self.speed * math.sin(rad_angle)
-        self.y -= self.speed * math.cos(rad_angle)
-
-# ADD THE MISSING LASERBEAM CLASS HERE
-class LaserBeam:
-    def __init__(self, x, y, damage):
-        self.x = x
-        self.y = y
-        self.width = 6
-        self.height = 30
-        self.damage = damage
-        self.speed = 10
-        self.active = True
-        self.timer = 30
+# Entity store: each archetype keeps its components in contiguous arrays, one row per entity
+ENTITY_COMPONENTS = {
+    "pos": ((2,), np.float64),
+    "prev": ((2,), np.float64),
+    "vel": ((2,), np.float64),
+    "radius": ((), np.float64),
+    "health": ((), np.float64),
+    "damage": ((), np.float64)
+}
+
+# Hard per-category ceilings that bound worst-case memory and frame cost. Gameplay archetypes
+# never evict a live row; a spawn that would overflow is refused and counted as dropped.
+# Particles are cosmetic, so a full pool evicts its oldest particles to make room.
+ENTITY_BUDGETS = {
+    "bullets": 512,
+    "enemy_bullets": 2048,
+    "power_ups": 64,
+    "particles": 16384
+}
+BUDGET_RECORD = struct.Struct(f"<{len(ENTITY_BUDGETS)}I")
+
+def pack_budgets(budgets):
+    return BUDGET_RECORD.pack(*(budgets[name] for name in ENTITY_BUDGETS))
+
+def unpack_budgets(data, offset):
+    return dict(zip(ENTITY_BUDGETS, BUDGET_RECORD.unpack_from(data, offset)))
+
+class Archetype:
+    def __init__(self, name, components=None, capacity=64, objects=False, bounds=((-np.inf, -np.inf), (np.inf, np.inf)),
+                 limit=None):
+        self.name = name
+        # Rows whose position leaves this box are culled after they move
+        self.bounds = bounds
+        self.components = dict(ENTITY_COMPONENTS, **(components or {}))
+        self.limit = limit
+        if limit is not None:
+            capacity = min(capacity, limit)
+        self.capacity = capacity
+        self.count = 0
+        self.spawned = 0
+        # Rows spawned into slots an earlier entity had occupied, i.e. below the high-water mark
+        self.reused = 0
+        self.dropped = 0
+        self.high_water = 0
+        for component, (shape, dtype) in self.components.items():
+            setattr(self, component, np.zeros((capacity,) + shape, dtype))
+        # Archetypes with per-entity behaviour keep the owning objects row-aligned
+        self.objects = [] if objects else None
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, capacity=None):
+        if capacity is None:
+            capacity = self.capacity * 2
+            if self.limit is not None:
+                capacity = min(capacity, self.limit)
+        for component, (shape, dtype) in self.components.items():
+            column = np.zeros((capacity,) + shape, dtype)
+            column[:self.count] = getattr(self, component)[:self.count]
+            setattr(self, component, column)
+        self.capacity = capacity
+
+    def spawn(self, **values):
+        return self.spawn_many(1, **values)
+
+    def spawn_many(self, count, **values):
+        # Appends count rows in one pass per component; values broadcast across the new rows.
+        # Over budget the whole volley is refused so fans and rings never come out lopsided.
+        if self.limit is not None and self.count + count > self.limit:
+            self.dropped += count
+            return None
+        while self.count + count > self.capacity:
+            self.grow()
+        start = self.count
+        end = start + count
+        for component in self.components:
+            getattr(self, component)[start:end] = values.get(component, 0)
+        self.count = end
+        self.spawned += count
+        self.reused += max(0, min(end, self.high_water) - start)
+        if end > self.high_water:
+            self.high_water = end
+        return start
+
+    def attach(self, entity, **values):
+        entity.archetype = self
+        entity.row = self.spawn(**values)
+        self.objects.append(entity)
+
+    def remove(self, dead):
+        # Order-preserving compaction; dead is a boolean mask over the live rows
+        count = self.count
+        keep = ~dead
+        alive = int(np.count_nonzero(keep))
+        if alive == count:
+            return
+        for component in self.components:
+            column = getattr(self, component)
+            column[:alive] = np.compress(keep, column[:count], axis=0)
+        if self.objects is not None:
+            self.objects = [entity for entity, kept in zip(self.objects, keep.tolist()) if kept]
+            for row, entity in enumerate(self.objects):
+                entity.row = row
+        self.count = alive
+
+    def clear(self):
+        self.count = 0
+        if self.objects is not None:
+            self.objects = []
+
+    def dump(self):
+        count = self.count
+        return SNAPSHOT_COUNT.pack(count) + b"".join(getattr(self, component)[:count].tobytes()
+                                                    for component in self.components)
+
+    def load(self, data, offset):
+        # Replaces every row with those from dump(); archetypes with objects rebuild them on top
+        count, = SNAPSHOT_COUNT.unpack_from(data, offset)
+        offset += SNAPSHOT_COUNT.size
+        if self.limit is not None and count > self.limit:
+            raise ValueError(f"snapshot holds {count} {self.name}, over the budget of {self.limit}")
+        if count > self.capacity:
+            self.grow(count)
+        for component, (shape, dtype) in self.components.items():
+            size = count * math.prod(shape)
+            getattr(self, component)[:count] = np.frombuffer(data, dtype, size, offset).reshape((count,) + shape)
+            offset += size * np.dtype(dtype).itemsize
+        self.count = count
+        self.high_water = max(self.high_water, count)
+        return offset
+
+    def integrate(self):
+        count = self.count
+        self.prev[:count] = self.pos[:count]
+        self.pos[:count] += self.vel[:count]
+
+    def outside(self):
+        # Column-wise compares stay fast at thousands of rows, unlike broadcasting over pairs
+        (left, top), (right, bottom) = self.bounds
+        pos = self.pos[:self.count]
+        x = pos[:, 0]
+        y = pos[:, 1]
+        return (x < left) | (x > right) | (y < top) | (y > bottom)
+
+    def distance_sq(self, x, y):
+        pos = self.pos[:self.count]
+        dx = pos[:, 0] - x
+        dy = pos[:, 1] - y
+        return dx*dx + dy*dy
+
+    def swept_distance_sq(self, rows, x0, y0, x, y):
+        # Closest approach of each row to a point that moved from (x0, y0) to (x, y) during the same tick
+        start = self.prev[rows] - (x0, y0)
+        path = self.pos[rows] - (x, y) - start
+        return segment_distance_sq(start, path, np.zeros_like(start), np.zeros_like(start))
+
+    def render_positions(self, alpha):
+        count = self.count
+        prev = self.prev[:count]
+        return (prev + (self.pos[:count] - prev) * alpha).tolist()
+
+    @property
+    def reuse_rate(self):
+        return self.reused / self.spawned if self.spawned else 0.0
+
+    def stats(self):
+        return {
+            "active": self.count,
+            "capacity": self.capacity,
+            "limit": self.limit,
+            "high_water": self.high_water,
+            "spawned": self.spawned,
+            "reused": self.reused,
+            "reuse_rate": self.reuse_rate,
+            "dropped": self.dropped
+        }
 
-    def draw(self):
-        if self.active:
-            pygame.draw.rect(screen, CYAN, (self.x - self.width//2, self.y, self.width, self.height))
-            pygame.draw.rect(screen, BLUE, (self.x - self.width//4, self.y, self.width//2, self.height))
-            pygame.draw.circle(screen, WHITE, (self.x, self.y), self.width//2)
+class EntityStore:
+    def __init__(self):
+        self.archetypes = {}
+
+    def __getitem__(self, name):
+        return self.archetypes[name]
+
+    def __iter__(self):
+        return iter(self.archetypes.values())
+
+    def add(self, archetype):
+        self.archetypes[archetype.name] = archetype
+        return archetype
+
+    def clear(self):
+        for archetype in self.archetypes.values():
+            archetype.clear()
+
+    def stats(self):
+        return {name: archetype.stats() for name, archetype in self.archetypes.items()}
+
+def component(name, index=None):
+    # Attribute view of an entity's row in one of its archetype's component arrays
+    if index is None:
+        def get(self):
+            return float(getattr(self.archetype, name)[self.row])
+        def set(self, value):
+            getattr(self.archetype, name)[self.row] = value
+    else:
+        def get(self):
+            return float(getattr(self.archetype, name)[self.row, index])
+        def set(self, value):
+            getattr(self.archetype, name)[self.row, index] = value
+    return property(get, set)
+
+# Projectile velocity tables: one row per firing angle, computed once per pattern.
+# Angle 0 points along +y; vertical=-1 flips it so player shots travel up the screen.
+STRAIGHT = (0,)
+CENTER = (0,)
+velocity_tables = {}
+
+def velocity_table(speed, angles, vertical=1):
+    key = (speed, angles, vertical)
+    table = velocity_tables.get(key)
+    if table is None:
+        table = velocity_tables[key] = np.array([
+            (speed * math.sin(math.radians(angle)), vertical * (speed * math.cos(math.radians(angle))))
+            for angle in angles])
+    return table
+
+def volley(x, y, barrels, velocity):
+    # Spawn positions and velocities for every angle from each barrel, barrel by barrel;
+    # barrels are horizontal offsets from x
+    if len(barrels) == 1:
+        return (x + barrels[0], y), velocity
+    pos = np.empty((len(barrels) * len(velocity), 2))
+    pos[:, 0] = np.repeat(np.add(barrels, x), len(velocity))
+    pos[:, 1] = y
+    return pos, np.tile(velocity, (len(barrels), 1))
+
+# Player shots: bullets and laser beams share one archetype so hits resolve in firing order
+SHOT_BULLET = 0
+SHOT_LASER = 1
+BULLET_RADIUS = 4
+BULLET_SPEED = 7
+BULLET_TRAIL_LENGTH = 5
+LASER_WIDTH = 6
+LASER_HEIGHT = 30
+LASER_SPEED = 10
+LASER_LIFETIME = 30
+NO_EXPIRY = np.iinfo(np.int32).max
+
+class Bullets(Archetype):
+    def __init__(self, limit=None):
+        super().__init__("bullets", {
+            "kind": ((), np.int8),
+            "timer": ((), np.int32),
+            # Shots collide as capsules: a segment running length px down from pos, widened by radius
+            "length": ((), np.float64),
+            "trail": ((BULLET_TRAIL_LENGTH, 2), np.float64)
+        }, bounds=((0, 0), (WIDTH, HEIGHT)), limit=limit)
+        # Trails are ring buffers; every live row writes the same slot each tick, so one head serves all
+        self.trail_head = 0
+        self.sprites = {}
+
+    def fire_bullet(self, x, y, damage=1, angles=STRAIGHT, barrels=CENTER):
+        pos, velocity = volley(x, y, barrels, velocity_table(BULLET_SPEED, angles, -1))
+        return self.spawn_many(len(velocity), pos=pos, prev=pos, vel=velocity,
+                               radius=BULLET_RADIUS, length=0, damage=damage, kind=SHOT_BULLET, timer=NO_EXPIRY)
+
+    def dump(self):
+        return super().dump() + SNAPSHOT_COUNT.pack(self.trail_head)
+
+    def load(self, data, offset):
+        offset = super().load(data, offset)
+        self.trail_head, = SNAPSHOT_COUNT.unpack_from(data, offset)
+        return offset + SNAPSHOT_COUNT.size
+
+    def fire_laser(self, x, y, damage):
+        return self.spawn(pos=(x, y), prev=(x, y), vel=(0, -LASER_SPEED), radius=LASER_WIDTH//2,
+                          length=LASER_HEIGHT, damage=damage, kind=SHOT_LASER, timer=LASER_LIFETIME)
 
     def update(self):
-        self.timer -= 1
-        if self.timer <= 0:
-            self.active = False
-        self.y -= self.speed
-
-    def get_rect(self):
-        return pygame.Rect(self.x - self.width//2, self.y, self.width, self.height)
+        count = self.count
+        if not count:
+            return
+        # Lasers record a trail too but never draw it
+        self.trail[:count, self.trail_head] = self.pos[:count]
+        self.trail_head = (self.trail_head + 1) % BULLET_TRAIL_LENGTH
+        
+        self.integrate()
+        self.timer[:count] -= 1
+        dead = (self.timer[:count] <= 0) | self.outside()
+        if dead.any():
+            self.remove(dead)
+
+    def get_sprites(self, color):
+        # Faded trail discs, oldest first, followed by the bullet head
+        sprites = self.sprites.get(color)
+        if sprites is None:
+            sprites = []
+            for i in range(BULLET_TRAIL_LENGTH):
+                disc = pygame.Surface((BULLET_RADIUS*2, BULLET_RADIUS*2), pygame.SRCALPHA)
+                pygame.draw.circle(disc, (*color, max(0, 255 - i * 30)), (BULLET_RADIUS, BULLET_RADIUS), BULLET_RADIUS)
+                sprites.append(disc)
+            head = pygame.Surface((BULLET_RADIUS*2 + 1, BULLET_RADIUS*2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(head, color, (BULLET_RADIUS, BULLET_RADIUS), BULLET_RADIUS)
+            pygame.draw.circle(head, WHITE, (BULLET_RADIUS, BULLET_RADIUS), BULLET_RADIUS - 1)
+            sprites.append(head)
+            if pygame.display.get_surface() is not None:
+                sprites = [sprite.convert_alpha() for sprite in sprites]
+            self.sprites[color] = sprites
+        return sprites
+
+    def draw(self, surface, alpha=1.0):
+        count = self.count
+        if not count:
+            return
+        kinds = self.kind[:count].tolist()
+        damages = self.damage[:count].tolist()
+        # Bullets never expire, so their timer doubles as an age counter
+        shown = int(BULLET_TRAIL_LENGTH * quality.settings["trail"])
+        trail_lens = np.minimum(NO_EXPIRY - self.timer[:count], shown).tolist()
+        # Ring slots from oldest to newest
+        trails = self.trail[:count, (self.trail_head + np.arange(BULLET_TRAIL_LENGTH)) % BULLET_TRAIL_LENGTH].tolist()
+        
+        # Each trail point and bullet head is one blits entry
+        stamps = []
+        lasers = []
+        for row, (x, y) in enumerate(self.render_positions(alpha)):
+            if kinds[row] == SHOT_LASER:
+                lasers.append((x, y))
+                continue
+            
+            damage = damages[row]
+            sprites = self.get_sprites(YELLOW if damage == 1 else ORANGE if damage == 2 else RED)
+            trail_len = trail_lens[row]
+            for i, (trail_x, trail_y) in enumerate(trails[row][BULLET_TRAIL_LENGTH - trail_len:]):
+                stamps.append((sprites[i], (trail_x - BULLET_RADIUS, trail_y - BULLET_RADIUS)))
+            stamps.append((sprites[-1], (x - BULLET_RADIUS, y - BULLET_RADIUS)))
+        surface.blits(stamps, doreturn=False)
+        
+        for x, y in lasers:
+            pygame.draw.rect(surface, CYAN, (x - LASER_WIDTH//2, y, LASER_WIDTH, LASER_HEIGHT))
+            pygame.draw.rect(surface, BLUE, (x - LASER_WIDTH//4, y, LASER_WIDTH//2, LASER_HEIGHT))
+            pygame.draw.circle(surface, WHITE, (x, y), LASER_WIDTH//2)
+
+# Balance settings: enemy stat scaling, spawn roll thresholds and upgrade prices.
+# Games take a Balance so tuning sweeps can vary them without touching the defaults.
+class Balance:
+    DEFAULTS = {
+        "level_scale": 0.2,
+        "speed": 1.0,
+        "health": 1.0,
+        "shoot_chance": 1.0,
+        "value": 1.0,
+        "shooter_roll": 0.15,
+        "tank_roll": 0.25,
+        "fast_roll": 0.35,
+        "basic_roll": 0.5,
+        "upgrade_prices": {"speed": 100, "health": 100, "damage": 150, "fire_rate": 120}
+    }
+
+    def __init__(self, **overrides):
+        unknown = set(overrides) - set(self.DEFAULTS)
+        if unknown:
+            raise TypeError(f"unknown balance settings: {', '.join(sorted(unknown))}")
+        for name, value in self.DEFAULTS.items():
+            setattr(self, name, overrides.get(name, value))
+        self.upgrade_prices = {**self.DEFAULTS["upgrade_prices"], **overrides.get("upgrade_prices", {})}
+
+    def upgrade_price(self, upgrade, level):
+        return self.upgrade_prices[upgrade] * (2 ** (level - 1))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.DEFAULTS}
+
+DEFAULT_BALANCE = Balance()
 
 # Enhanced Enemy class with unique visual designs
 class Enemy:
-    def __init__(self, enemy_type, level=1):
+    x = component("pos", 0)
+    y = component("pos", 1)
+    prev_x = component("prev", 0)
+    prev_y = component("prev", 1)
+    speed = component("vel", 1)
+    health = component("health")
+
+    def __init__(self, enemy_type, level=1, rng=unseeded_random, archetype=None, balance=DEFAULT_BALANCE):
+        (archetype if archetype is not None else Enemies()).attach(self)
         self.type = enemy_type
         self.level = level
+        self.ai_rng = rng.enemy_ai
+        spawn_rng = rng.waves
         
-        level_multiplier = 1 + (level * 0.2)
+        level_multiplier = 1 + (level * balance.level_scale)
         
         if enemy_type == EnemyType.BASIC:
             self.width = 45
             self.height = 35
-            self.speed = random.uniform(1.0, 2.0) * level_multiplier
+            self.speed = spawn_rng.uniform(1.0, 2.0) * level_multiplier
             self.health = 1
             self.max_health = 1
             self.color = (200, 50, 50)  # Reddish
@@ -325,7 +1411,7 @@ class Enemy:
         elif enemy_type == EnemyType.FAST:
             self.width = 35
             self.height = 25
-            self.speed = random.uniform(2.0, 3.5) * level_multiplier
+            self.speed = spawn_rng.uniform(2.0, 3.5) * level_multiplier
             self.health = 1
             self.max_health = 1
             self.color = (180, 70, 200)  # Purple
@@ -336,7 +1422,7 @@ class Enemy:
         elif enemy_type == EnemyType.TANK:
             self.width = 65
             self.height = 50
-            self.speed = random.uniform(0.5, 1.5) * level_multiplier
+            self.speed = spawn_rng.uniform(0.5, 1.5) * level_multiplier
             self.health = int((3 + level) * level_multiplier)
             self.max_health = int((3 + level) * level_multiplier)
             self.color = (100, 30, 30)  # Dark red
@@ -347,7 +1433,7 @@ class Enemy:
         elif enemy_type == EnemyType.SHOOTER:
             self.width = 40
             self.height = 40
-            self.speed = random.uniform(1.0, 1.5) * level_multiplier
+            self.speed = spawn_rng.uniform(1.0, 1.5) * level_multiplier
             self.health = int(2 * level_multiplier)
             self.max_health = int(2 * level_multiplier)
             self.color = (220, 120, 0)  # Orange
@@ -369,243 +1455,720 @@ class Enemy:
             self.attack_timer = 0
             self.movement_timer = 0
         
-        self.x = random.randint(self.width, WIDTH - self.width)
-        self.y = random.randint(-100, -40)
+        self.speed *= balance.speed
+        self.health = self.max_health = max(1, int(self.max_health * balance.health))
+        self.value = int(self.value * balance.value)
+        self.shoot_chance *= balance.shoot_chance
+        
+        self.x = self.prev_x = spawn_rng.randint(self.width, WIDTH - self.width)
+        self.y = self.prev_y = spawn_rng.randint(-100, -40)
+        archetype = self.archetype
+        archetype.radius[self.row] = self.width//2
+        archetype.damage[self.row] = 25 if enemy_type == EnemyType.BOSS else 10
+        # The boss steers itself; everything else drifts down at its speed
+        archetype.steered[self.row] = enemy_type == EnemyType.BOSS
         self.hit_effect = 0
         self.last_shot = 0
         self.engine_pulse = 0
 
-    def draw(self):
+    def draw(self, alpha=1.0):
+        x, y = interpolate(self, alpha)
         if self.hit_effect > 0:
-            pygame.draw.circle(screen, WHITE, (self.x, self.y), self.width + self.hit_effect, 3)
+            ring, offset = enemy_sprites.hit_ring(self.width + self.hit_effect)
+            screen.blit(ring, (x - offset, y - offset))
             self.hit_effect -= 1
         
         # Engine pulse effect
         self.engine_pulse = (self.engine_pulse + 0.2) % (2 * math.pi)
         engine_glow = int(10 + 5 * math.sin(self.engine_pulse))
         
-        if self.type == EnemyType.BASIC:
-            # Saucer shape for basic enemies
-            pygame.draw.circle(screen, self.color, (self.x, self.y), self.width//2)
-            pygame.draw.circle(screen, self.secondary_color, (self.x, self.y), self.width//3)
-            pygame.draw.circle(screen, BLACK, (self.x, self.y), self.width//6)
+        hull, (ox, oy) = enemy_sprites.hull(self)
+        screen.blit(hull, (x - ox, y - oy))
+        glow, (ox, oy) = enemy_sprites.glow(self, engine_glow)
+        screen.blit(glow, (x - ox, y - oy))
+        
+        # Health bar for enemies with more than 1 health
+        if self.health < self.max_health:
+            bar_width = self.width
+            bar_height = 5
+            health_ratio = self.health / self.max_health
+            health_color = GREEN if health_ratio > 0.5 else YELLOW if health_ratio > 0.25 else RED
             
-            # Engine glow
-            pygame.draw.circle(screen, YELLOW, (self.x - 15, self.y + 10), 3 + engine_glow//3)
-            pygame.draw.circle(screen, YELLOW, (self.x + 15, self.y + 10), 3 + engine_glow//3)
+            pygame.draw.rect(screen, RED, (x - bar_width//2, y - self.height//2 - 10, bar_width, bar_height))
+            pygame.draw.rect(screen, health_color, (x - bar_width//2, y - self.height//2 - 10, bar_width * health_ratio, bar_height))
+
+    def steer(self, now):
+        self.movement_timer += 1
+        self.attack_timer += 1
+        
+        if self.movement_timer > 180:
+            self.attack_pattern = self.ai_rng.randint(0, 2)
+            self.movement_timer = 0
             
-        elif self.type == EnemyType.FAST:
+        if self.attack_pattern == 0:
+            self.x += math.sin(now * 0.005) * 3
+            self.y += 0.5
+        elif self.attack_pattern == 1:
+            t = now * 0.002
+            self.x = WIDTH//2 + math.sin(t) * 150
+            self.y = 100 + math.sin(2*t) * 50
+        elif self.attack_pattern == 2:
+            self.y += 1
+            if self.y > 150:
+                self.y = 150
+
+    def shoot(self, enemy_bullets, now):
+        if self.ai_rng.random() < self.shoot_chance and now - self.last_shot > 1000:
+            if self.type == EnemyType.BOSS:
+                if self.attack_timer > 120:
+                    self.attack_pattern = self.ai_rng.randint(0, 2)
+                    self.attack_timer = 0
+                
+                if self.attack_pattern == 0:
+                    fired = enemy_bullets.fire(self.x, self.y + self.height//2, ENEMY_BULLET_FAN)
+                elif self.attack_pattern == 1:
+                    fired = enemy_bullets.fire(self.x, self.y + self.height//2, barrels=BOSS_CANNONS)
+                else:
+                    fired = enemy_bullets.fire(self.x, self.y + self.height//2, ENEMY_BULLET_RING)
+            else:
+                fired = enemy_bullets.fire(self.x, self.y + self.height//2)
+            
+            # Over the enemy bullet budget the volley is refused and the gun stays ready
+            if fired is None:
+                return False
+            self.last_shot = now
+            return True
+        return False
+
+class Enemies(Archetype):
+    def __init__(self):
+        super().__init__("enemies", {"steered": ((), np.bool_)}, objects=True,
+                         bounds=((-np.inf, -np.inf), (np.inf, HEIGHT + 100)))
+
+    def dump(self):
+        return super().dump() + b"".join(ENEMY_SNAPSHOT.pack(enemy) for enemy in self.objects)
+
+    def load(self, data, offset):
+        # Enemies come back without an ai_rng; the owning game re-binds its stream
+        offset = super().load(data, offset)
+        self.objects = []
+        for row in range(self.count):
+            enemy = Enemy.__new__(Enemy)
+            enemy.archetype = self
+            enemy.row = row
+            offset = ENEMY_SNAPSHOT.unpack_into(enemy, data, offset)
+            self.objects.append(enemy)
+        return offset
+
+    def update(self, now, enemy_bullets):
+        # Returns how many enemies slipped off the bottom of the screen
+        count = self.count
+        if not count:
+            return 0
+        self.prev[:count] = self.pos[:count]
+        self.pos[:count] += self.vel[:count] * ~self.steered[:count, None]
+        
+        objects = self.objects
+        for row in np.flatnonzero(self.steered[:count]).tolist():
+            objects[row].steer(now)
+        for enemy in objects:
+            enemy.shoot(enemy_bullets, now)
+        
+        escaped = self.outside()
+        escaped_count = int(np.count_nonzero(escaped))
+        if escaped_count:
+            self.remove(escaped)
+        return escaped_count
+
+# Enemy sprite atlas: hulls are rendered once per type and size, animated parts as small overlays
+ENEMY_SPRITE_PADDING = 40
+
+class EnemySpriteAtlas:
+    def __init__(self):
+        self.hulls = {}
+        self.glows = {}
+        self.rings = {}
+
+    def bake(self, width, height, draw):
+        # Draw around an anchor on a padded canvas, then crop to the painted pixels
+        anchor_x = width//2 + ENEMY_SPRITE_PADDING
+        anchor_y = height//2 + ENEMY_SPRITE_PADDING
+        canvas = pygame.Surface((width + ENEMY_SPRITE_PADDING*2, height + ENEMY_SPRITE_PADDING*2), pygame.SRCALPHA)
+        draw(canvas, anchor_x, anchor_y)
+        bounds = canvas.get_bounding_rect()
+        sprite = canvas.subsurface(bounds).copy()
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        return sprite, (anchor_x - bounds.x, anchor_y - bounds.y)
+
+    def hull(self, enemy):
+        key = (enemy.type, enemy.level if enemy.type == EnemyType.BOSS else 0)
+        sprite = self.hulls.get(key)
+        if sprite is None:
+            sprite = self.hulls[key] = self.bake(enemy.width, enemy.height, lambda surface, x, y: self.draw_hull(surface, enemy, x, y))
+        return sprite
+
+    def glow(self, enemy, engine_glow):
+        key = (enemy.type, enemy.level if enemy.type == EnemyType.BOSS else 0, engine_glow)
+        sprite = self.glows.get(key)
+        if sprite is None:
+            sprite = self.glows[key] = self.bake(enemy.width, enemy.height, lambda surface, x, y: self.draw_glow(surface, enemy, x, y, engine_glow))
+        return sprite
+
+    def hit_ring(self, radius):
+        sprite = self.rings.get(radius)
+        if sprite is None:
+            ring = pygame.Surface((radius*2 + 1, radius*2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(ring, WHITE, (radius, radius), radius, 3)
+            if pygame.display.get_surface() is not None:
+                ring = ring.convert_alpha()
+            sprite = self.rings[radius] = (ring, radius)
+        return sprite
+
+    def draw_hull(self, surface, enemy, x, y):
+        width, height = enemy.width, enemy.height
+        
+        if enemy.type == EnemyType.BASIC:
+            # Saucer shape for basic enemies
+            pygame.draw.circle(surface, enemy.color, (x, y), width//2)
+            pygame.draw.circle(surface, enemy.secondary_color, (x, y), width//3)
+            pygame.draw.circle(surface, BLACK, (x, y), width//6)
+            
+        elif enemy.type == EnemyType.FAST:
             # Arrow shape for fast enemies
-            pygame.draw.polygon(screen, self.color, [
-                (self.x, self.y - self.height//2),
-                (self.x - self.width//2, self.y + self.height//2),
-                (self.x + self.width//2, self.y + self.height//2)
+            pygame.draw.polygon(surface, enemy.color, [
+                (x, y - height//2),
+                (x - width//2, y + height//2),
+                (x + width//2, y + height//2)
             ])
-            pygame.draw.polygon(screen, self.secondary_color, [
-                (self.x, self.y - self.height//4),
-                (self.x - self.width//4, self.y + self.height//4),
-                (self.x + self.width//4, self.y + self.height//4)
+            pygame.draw.polygon(surface, enemy.secondary_color, [
+                (x, y - height//4),
+                (x - width//4, y + height//4),
+                (x + width//4, y + height//4)
             ])
             
-            # Engine glow
-            pygame.draw.circle(screen, CYAN, (self.x, self.y + self.height//2 + 5), 4 + engine_glow//2)
-            
-        elif self.type == EnemyType.TANK:
+        elif enemy.type == EnemyType.TANK:
             # Heavy armored look for tanks
-            pygame.draw.rect(screen, self.color, (self.x - self.width//2, self.y - self.height//2, self.width, self.height), border_radius=8)
-            pygame.draw.rect(screen, self.secondary_color, (self.x - self.width//3, self.y - self.height//3, self.width*2//3, self.height*2//3), border_radius=5)
+            pygame.draw.rect(surface, enemy.color, (x - width//2, y - height//2, width, height), border_radius=8)
+            pygame.draw.rect(surface, enemy.secondary_color, (x - width//3, y - height//3, width*2//3, height*2//3), border_radius=5)
             
             # Armor plates
-            pygame.draw.rect(screen, SILVER, (self.x - self.width//2 + 5, self.y - self.height//2 + 5, self.width - 10, 8))
-            pygame.draw.rect(screen, SILVER, (self.x - self.width//2 + 5, self.y + self.height//2 - 13, self.width - 10, 8))
+            pygame.draw.rect(surface, SILVER, (x - width//2 + 5, y - height//2 + 5, width - 10, 8))
+            pygame.draw.rect(surface, SILVER, (x - width//2 + 5, y + height//2 - 13, width - 10, 8))
             
-            # Engine glow
-            for i in range(3):
-                offset = -10 + i * 10
-                pygame.draw.circle(screen, RED, (self.x + offset, self.y + self.height//2 + 5), 3 + engine_glow//3)
-            
-        elif self.type == EnemyType.SHOOTER:
+        elif enemy.type == EnemyType.SHOOTER:
             # Gun turret design for shooters
-            pygame.draw.circle(screen, self.color, (self.x, self.y), self.width//2)
-            pygame.draw.rect(screen, self.secondary_color, (self.x - self.width//4, self.y - self.height//4, self.width//2, self.height//2))
+            pygame.draw.circle(surface, enemy.color, (x, y), width//2)
+            pygame.draw.rect(surface, enemy.secondary_color, (x - width//4, y - height//4, width//2, height//2))
             
             # Gun barrels
-            pygame.draw.rect(screen, SILVER, (self.x - 15, self.y - 20, 8, 15))
-            pygame.draw.rect(screen, SILVER, (self.x + 7, self.y - 20, 8, 15))
-            
-            # Engine glow
-            pygame.draw.circle(screen, ORANGE, (self.x, self.y + self.height//2 + 5), 4 + engine_glow//2)
+            pygame.draw.rect(surface, SILVER, (x - 15, y - 20, 8, 15))
+            pygame.draw.rect(surface, SILVER, (x + 7, y - 20, 8, 15))
             
-        elif self.type == EnemyType.BOSS:
+        elif enemy.type == EnemyType.BOSS:
             # Massive battleship design for boss
             # Main body
-            pygame.draw.ellipse(screen, self.color, (self.x - self.width//2, self.y - self.height//2, self.width, self.height))
+            pygame.draw.ellipse(surface, enemy.color, (x - width//2, y - height//2, width, height))
             
             # Secondary color details
-            pygame.draw.ellipse(screen, self.secondary_color, (self.x - self.width//3, self.y - self.height//3, self.width*2//3, self.height*2//3))
+            pygame.draw.ellipse(surface, enemy.secondary_color, (x - width//3, y - height//3, width*2//3, height*2//3))
             
             # Bridge/tower
-            pygame.draw.rect(screen, DARK_BLUE, (self.x - 20, self.y - self.height//2 - 10, 40, 20))
+            pygame.draw.rect(surface, DARK_BLUE, (x - 20, y - height//2 - 10, 40, 20))
             
             # Weapon turrets
-            pygame.draw.circle(screen, SILVER, (self.x - 40, self.y - 10), 12)
-            pygame.draw.circle(screen, SILVER, (self.x + 40, self.y - 10), 12)
-            pygame.draw.circle(screen, SILVER, (self.x - 60, self.y + 10), 10)
-            pygame.draw.circle(screen, SILVER, (self.x + 60, self.y + 10), 10)
-            
-            # Engine glow
-            for i in range(5):
-                offset = -40 + i * 20
-                glow_size = 5 + engine_glow//2
-                pygame.draw.circle(screen, RED, (self.x + offset, self.y + self.height//2 + 5), glow_size)
+            pygame.draw.circle(surface, SILVER, (x - 40, y - 10), 12)
+            pygame.draw.circle(surface, SILVER, (x + 40, y - 10), 12)
+            pygame.draw.circle(surface, SILVER, (x - 60, y + 10), 10)
+            pygame.draw.circle(surface, SILVER, (x + 60, y + 10), 10)
             
             # Boss level indicator
-            level_text = small_font.render(f"BOSS LVL {self.level}", True, WHITE)
-            screen.blit(level_text, (self.x - level_text.get_width()//2, self.y - self.height//2 - 30))
+            level_text = text_cache.render(small_font, f"BOSS LVL {enemy.level}", True, WHITE)
+            surface.blit(level_text, (x - level_text.get_width()//2, y - height//2 - 30))
+
+    def draw_glow(self, surface, enemy, x, y, engine_glow):
+        height = enemy.height
         
-        # Health bar for enemies with more than 1 health
-        if self.health < self.max_health:
-            bar_width = self.width
-            bar_height = 5
-            health_ratio = self.health / self.max_health
-            health_color = GREEN if health_ratio > 0.5 else YELLOW if health_ratio > 0.25 else RED
+        if enemy.type == EnemyType.BASIC:
+            # Engine glow
+            pygame.draw.circle(surface, YELLOW, (x - 15, y + 10), 3 + engine_glow//3)
+            pygame.draw.circle(surface, YELLOW, (x + 15, y + 10), 3 + engine_glow//3)
             
-            pygame.draw.rect(screen, RED, (self.x - bar_width//2, self.y - self.height//2 - 10, bar_width, bar_height))
-            pygame.draw.rect(screen, health_color, (self.x - bar_width//2, self.y - self.height//2 - 10, bar_width * health_ratio, bar_height))
-
-    def update(self):
-        if self.type == EnemyType.BOSS:
-            self.movement_timer += 1
-            self.attack_timer += 1
+        elif enemy.type == EnemyType.FAST:
+            # Engine glow
+            pygame.draw.circle(surface, CYAN, (x, y + height//2 + 5), 4 + engine_glow//2)
             
-            if self.movement_timer > 180:
-                self.attack_pattern = random.randint(0, 2)
-                self.movement_timer = 0
-                
-            if self.attack_pattern == 0:
-                self.x += math.sin(pygame.time.get_ticks() * 0.005) * 3
-                self.y += 0.5
-            elif self.attack_pattern == 1:
-                t = pygame.time.get_ticks() * 0.002
-                self.x = WIDTH//2 + math.sin(t) * 150
-                self.y = 100 + math.sin(2*t) * 50
-            elif self.attack_pattern == 2:
-                self.y += 1
-                if self.y > 150:
-                    self.y = 150
-        else:
-            self.y += self.speed
-
-    def shoot(self, enemy_bullets):
-        if random.random() < self.shoot_chance and pygame.time.get_ticks() - self.last_shot > 1000:
-            if self.type == EnemyType.BOSS:
-                if self.attack_timer > 120:
-                    self.attack_pattern = random.randint(0, 2)
-                    self.attack_timer = 0
-                
-                if self.attack_pattern == 0:
-                    for angle in range(-45, 46, 15):
-                        enemy_bullets.append(EnemyBullet(self.x, self.y + self.height//2, angle))
-                elif self.attack_pattern == 1:
-                    enemy_bullets.append(EnemyBullet(self.x - 40, self.y + self.height//2))
-                    enemy_bullets.append(EnemyBullet(self.x + 40, self.y + self.height//2))
-                    enemy_bullets.append(EnemyBullet(self.x, self.y + self.height//2))
-                else:
-                    for angle in range(0, 360, 30):
-                        enemy_bullets.append(EnemyBullet(self.x, self.y + self.height//2, angle))
-            else:
-                enemy_bullets.append(EnemyBullet(self.x, self.y + self.height//2))
+        elif enemy.type == EnemyType.TANK:
+            # Engine glow
+            for i in range(3):
+                offset = -10 + i * 10
+                pygame.draw.circle(surface, RED, (x + offset, y + height//2 + 5), 3 + engine_glow//3)
             
-            self.last_shot = pygame.time.get_ticks()
-            return True
-        return False
+        elif enemy.type == EnemyType.SHOOTER:
+            # Engine glow
+            pygame.draw.circle(surface, ORANGE, (x, y + height//2 + 5), 4 + engine_glow//2)
+            
+        elif enemy.type == EnemyType.BOSS:
+            # Engine glow
+            for i in range(5):
+                offset = -40 + i * 20
+                glow_size = 5 + engine_glow//2
+                pygame.draw.circle(surface, RED, (x + offset, y + height//2 + 5), glow_size)
 
-# Enemy bullets
-class EnemyBullet:
-    def __init__(self, x, y, angle=0):
-        self.x = x
-        self.y = y
-        self.radius = 3
-        self.speed = 4
-        self.angle = angle
-        self.color = RED
+enemy_sprites = EnemySpriteAtlas()
 
-    def draw(self):
-        pygame.draw.circle(screen, self.color, (self.x, self.y), self.radius)
-        pygame.draw.circle(screen, YELLOW, (self.x, self.y), self.radius - 1)
+# Enemy bullets
+ENEMY_BULLET_RADIUS = 3
+ENEMY_BULLET_SPEED = 4
+ENEMY_BULLET_DAMAGE = 5
+# Enemies fire from as high as y = -100, so the top edge is culled with some headroom
+ENEMY_BULLET_MARGIN = 120
+ENEMY_BULLET_FAN = tuple(range(-45, 46, 15))
+ENEMY_BULLET_RING = tuple(range(0, 360, 30))
+BOSS_CANNONS = (-40, 40, 0)
+
+class EnemyBullets(Archetype):
+    def __init__(self, limit=None):
+        super().__init__("enemy_bullets", bounds=((0, -ENEMY_BULLET_MARGIN), (WIDTH, HEIGHT)), limit=limit)
+
+    def fire(self, x, y, angles=STRAIGHT, barrels=CENTER):
+        pos, velocity = volley(x, y, barrels, velocity_table(ENEMY_BULLET_SPEED, angles))
+        return self.spawn_many(len(velocity), pos=pos, prev=pos, vel=velocity,
+                               radius=ENEMY_BULLET_RADIUS, damage=ENEMY_BULLET_DAMAGE)
 
     def update(self):
-        rad_angle = math.radians(self.angle)
-        self.x += self.speed * math.sin(rad_angle)
-        self.y += self.speed * math.cos(rad_angle)
-
-# Power-up class
-class PowerUp:
-    def __init__(self, x, y, power_type):
-        self.x = x
-        self.y = y
-        self.radius = 15
-        self.speed = 2
-        self.type = power_type
-        self.colors = {1: GREEN, 2: BLUE, 3: YELLOW, 4: CYAN, 5: GOLD}
-        self.symbols = {1: "H", 2: "W", 3: "L", 4: "S", 5: "$"}
-        self.pulse = 0
-        self.pulse_dir = 1
-
-    def draw(self):
-        self.pulse += 0.1 * self.pulse_dir
-        if self.pulse > 1 or self.pulse < 0:
-            self.pulse_dir *= -1
-        
-        pulse_radius = self.radius + int(3 * self.pulse)
-        color = self.colors[self.type]
-        
-        pygame.draw.circle(screen, color, (self.x, self.y), pulse_radius)
-        pygame.draw.circle(screen, WHITE, (self.x, self.y), pulse_radius, 2)
-        
-        symbol_text = game_font.render(self.symbols[self.type], True, WHITE)
-        symbol_rect = symbol_text.get_rect(center=(self.x, self.y))
-        screen.blit(symbol_text, symbol_rect)
+        count = self.count
+        if not count:
+            return
+        self.integrate()
+        dead = self.outside()
+        if dead.any():
+            self.remove(dead)
+
+    def draw(self, surface, alpha=1.0):
+        for x, y in self.render_positions(alpha):
+            pygame.draw.circle(surface, RED, (x, y), ENEMY_BULLET_RADIUS)
+            pygame.draw.circle(surface, YELLOW, (x, y), ENEMY_BULLET_RADIUS - 1)
+
+# Power-ups
+POWER_UP_RADIUS = 15
+POWER_UP_SPEED = 2
+POWER_UP_COLORS = {1: GREEN, 2: BLUE, 3: YELLOW, 4: CYAN, 5: GOLD}
+POWER_UP_SYMBOLS = {1: "H", 2: "W", 3: "L", 4: "S", 5: "$"}
+
+class PowerUps(Archetype):
+    def __init__(self, limit=None):
+        super().__init__("power_ups", {
+            "kind": ((), np.int8),
+            "pulse": ((), np.float64),
+            "pulse_dir": ((), np.float64)
+        }, bounds=((-np.inf, -np.inf), (np.inf, HEIGHT + 50)), limit=limit)
+
+    def drop(self, x, y, power_type):
+        return self.spawn(pos=(x, y), prev=(x, y), vel=(0, POWER_UP_SPEED), radius=POWER_UP_RADIUS,
+                          kind=power_type, pulse_dir=1)
 
     def update(self):
-        self.y += self.speed
+        count = self.count
+        if not count:
+            return
+        self.integrate()
+        dead = self.outside()
+        if dead.any():
+            self.remove(dead)
+
+    def draw(self, surface, alpha=1.0):
+        count = self.count
+        if not count:
+            return
+        pulse = self.pulse[:count]
+        pulse_dir = self.pulse_dir[:count]
+        pulse += 0.1 * pulse_dir
+        pulse_dir[(pulse > 1) | (pulse < 0)] *= -1
+        
+        kinds = self.kind[:count].tolist()
+        for (x, y), power_type, level in zip(self.render_positions(alpha), kinds, pulse.tolist()):
+            pulse_radius = POWER_UP_RADIUS + int(3 * level)
+            pygame.draw.circle(surface, POWER_UP_COLORS[power_type], (x, y), pulse_radius)
+            pygame.draw.circle(surface, WHITE, (x, y), pulse_radius, 2)
+            
+            symbol_text = text_cache.render(game_font, POWER_UP_SYMBOLS[power_type], True, WHITE)
+            symbol_rect = symbol_text.get_rect(center=(x, y))
+            surface.blit(symbol_text, symbol_rect)
+
+# Particle system: structure-of-arrays storage with pre-rendered alpha discs
+PARTICLE_CAPACITY = ENTITY_BUDGETS["particles"]
+PARTICLE_ALPHA_LEVELS = 16
+
+class ParticleSystem:
+    def __init__(self, capacity=PARTICLE_CAPACITY, rng=None):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.initial_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        # Emission serial of each particle; compaction reorders slots, so age is tracked explicitly
+        self.born = np.zeros(capacity, dtype=np.int64)
+        self.arrays = (self.pos, self.vel, self.life, self.initial_life, self.size, self.color, self.born)
+        self.emitted = 0
+        self.evicted = 0
+        self.high_water = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.palette = []
+        self.palette_index = {}
+        self.sprites = {}
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def stats(self):
+        return {
+            "active": self.count,
+            "capacity": self.capacity,
+            "limit": self.capacity,
+            "high_water": self.high_water,
+            "spawned": self.emitted,
+            "evicted": self.evicted
+        }
 
-# Particle effect class
-class Particle:
-    def __init__(self, x, y, color, size=None, life=None):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = size or random.randint(2, 6)
-        self.speed_x = random.uniform(-3, 3)
-        self.speed_y = random.uniform(-3, 3)
-        self.life = life or random.randint(20, 40)
-        self.initial_life = self.life
+    def dump(self):
+        count = self.count
+        return b"".join([PARTICLE_SNAPSHOT.pack(count, self.emitted, len(self.palette)),
+                         b"".join(bytes(color) for color in self.palette)]
+                        + [array[:count].tobytes() for array in self.arrays])
+
+    def load(self, data, offset):
+        count, emitted, colors = PARTICLE_SNAPSHOT.unpack_from(data, offset)
+        offset += PARTICLE_SNAPSHOT.size
+        palette = [tuple(data[i:i + 3]) for i in range(offset, offset + colors * 3, 3)]
+        offset += colors * 3
+        if palette != self.palette:
+            self.sprites = {}
+        self.palette = palette
+        self.palette_index = {color: index for index, color in enumerate(palette)}
+        # A snapshot from a larger pool keeps as many particles as this one holds
+        kept = min(count, self.capacity)
+        for array in self.arrays:
+            size = count * (array.size // len(array))
+            values = np.frombuffer(data, array.dtype, size, offset).reshape((count,) + array.shape[1:])
+            array[:kept] = values[:kept]
+            offset += size * array.itemsize
+        self.count = kept
+        self.emitted = emitted
+        return offset
+
+    def color_index(self, color):
+        index = self.palette_index.get(color)
+        if index is None:
+            index = self.palette_index[color] = len(self.palette)
+            self.palette.append(color)
+        return index
+
+    def emit(self, x, y, color, count, size=(2, 6), life=(20, 40)):
+        # size and life are inclusive (low, high) ranges rolled per particle
+        start = self.count
+        if count > 0:
+            count = max(1, int(count * quality.settings["particles"]))
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+        end = start + count
+        rows = slice(start, end)
+        if end > self.capacity:
+            # Pool is full: the oldest particles give up their slots to the new burst
+            evict = end - self.capacity
+            oldest = np.argpartition(self.born[:start], evict - 1)[:evict]
+            rows = np.concatenate((oldest, np.arange(start, self.capacity)))
+            end = self.capacity
+            self.evicted += evict
+        rng = self.rng
+        self.pos[rows] = (x, y)
+        self.vel[rows] = rng.uniform(-3, 3, (count, 2))
+        self.size[rows] = rng.integers(size[0], size[1] + 1, count)
+        lives = rng.integers(life[0], life[1] + 1, count)
+        self.life[rows] = lives
+        self.initial_life[rows] = lives
+        self.color[rows] = self.color_index(color)
+        self.born[rows] = np.arange(self.emitted, self.emitted + count)
+        self.emitted += count
+        self.count = end
+        if end > self.high_water:
+            self.high_water = end
 
     def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.life -= 1
-        self.size = max(0, self.size - 0.1)
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.life[:n] -= 1
+        size = self.size[:n]
+        size -= 0.1
+        np.maximum(size, 0, out=size)
+        
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if len(dead):
+            # Swap-compaction: live particles from the tail fill the holes left in the head
+            new_count = n - len(dead)
+            holes = dead[dead < new_count]
+            movers = np.flatnonzero(self.life[new_count:n] > 0) + new_count
+            for array in self.arrays:
+                array[holes] = array[movers]
+            self.count = new_count
+
+    def get_sprite(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            color_index, diameter, alpha_level = key
+            alpha = alpha_level * 255 // (PARTICLE_ALPHA_LEVELS - 1)
+            radius = diameter / 2
+            sprite = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*self.palette[color_index], alpha), (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
 
-    def draw(self):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.initial_life))
-            particle_surf = pygame.Surface((self.size*2, self.size*2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surf, (*self.color, alpha), (self.size, self.size), self.size)
-            screen.blit(particle_surf, (self.x - self.size, self.y - self.size))
+    def draw(self, surface):
+        n = self.count
+        if n == 0:
+            return
+        size = self.size[:n]
+        diameter = (size * 2).astype(np.int32)
+        alpha_level = (self.life[:n] / self.initial_life[:n] * (PARTICLE_ALPHA_LEVELS - 1) + 0.5).astype(np.int32)
+        visible = (diameter > 0) & (alpha_level > 0)
+        if not visible.any():
+            return
+        
+        corner = (self.pos[:n] - size[:, None])[visible].astype(np.int32)
+        diameter = diameter[visible].astype(np.int64)
+        # One integer per (color, diameter, alpha) stamp; the diameter stride covers the largest one drawn
+        stride = int(diameter.max()) + 1
+        keys = (self.color[:n][visible] * stride + diameter) * PARTICLE_ALPHA_LEVELS + alpha_level[visible]
+        sprites = {}
+        for key in np.unique(keys).tolist():
+            color_index, rest = divmod(key, stride * PARTICLE_ALPHA_LEVELS)
+            sprites[key] = self.get_sprite((color_index, *divmod(rest, PARTICLE_ALPHA_LEVELS)))
+        
+        surface.blits([(sprites[key], pos) for key, pos in zip(keys.tolist(), corner.tolist())], doreturn=False)
+
+# Starfield: array-backed parallax layers drawn with vectorized pixel writes
+STAR_COUNT = 300
+STAR_COLORS = (WHITE, LIGHT_BLUE, YELLOW, CYAN)
+# (star radius, share of stars, min speed, max speed) from the far layer to the near one
+STAR_LAYERS = ((1, 0.5, 0.02, 0.1), (2, 0.3, 0.1, 0.2), (3, 0.2, 0.2, 0.3))
+
+class Starfield:
+    def __init__(self, count=STAR_COUNT, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.count = count
+        self.layers = []
+        xs, ys, speeds, colors = [], [], [], []
+        start = 0
+        for radius, share, min_speed, max_speed in STAR_LAYERS:
+            layer_count = int(round(count * share)) if radius != STAR_LAYERS[-1][0] else count - start
+            xs.append(rng.integers(0, WIDTH, layer_count))
+            ys.append(rng.uniform(0, HEIGHT, layer_count))
+            speeds.append(rng.uniform(min_speed, max_speed, layer_count))
+            colors.append(rng.integers(0, len(STAR_COLORS), layer_count))
+            self.layers.append((radius, start, start + layer_count))
+            start += layer_count
+        # Each layer is a contiguous slice, so drawing never needs per-frame masks
+        self.x = np.concatenate(xs).astype(np.intp)
+        self.y = np.concatenate(ys)
+        self.speed = np.concatenate(speeds)
+        self.color_index = np.concatenate(colors)
+        self.rgb = np.array(STAR_COLORS, dtype=np.uint8)[self.color_index]
+        self.offsets = {}
+        self.stamps = {}
+
+    def update(self, steps=1):
+        self.y += self.speed * steps
+        np.remainder(self.y, HEIGHT, out=self.y)
+
+    def visible_layers(self):
+        # Lower quality tiers thin every layer out by the same share
+        density = quality.settings["stars"]
+        return [(radius, start, start + int((end - start) * density)) for radius, start, end in self.layers]
+
+    def get_offsets(self, radius):
+        # Pixel offsets covered by pygame's own circle of this radius
+        offsets = self.offsets.get(radius)
+        if offsets is None:
+            stamp = pygame.Surface((radius*2 + 1, radius*2 + 1))
+            pygame.draw.circle(stamp, WHITE, (radius, radius), radius)
+            dx, dy = np.nonzero(pygame.surfarray.array2d(stamp))
+            offsets = self.offsets[radius] = list(zip((dx - radius).tolist(), (dy - radius).tolist()))
+        return offsets
+
+    def draw(self, surface):
+        try:
+            pixels = pygame.surfarray.pixels3d(surface)
+        except ValueError:
+            self.draw_stamps(surface)
+            return
+        width, height = surface.get_size()
+        ys = self.y.astype(np.intp)
+        for radius, start, end in self.visible_layers():
+            layer_x = self.x[start:end]
+            layer_y = ys[start:end]
+            layer_rgb = self.rgb[start:end]
+            for dx, dy in self.get_offsets(radius):
+                px = layer_x + dx
+                py = layer_y + dy
+                inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                pixels[px[inside], py[inside]] = layer_rgb[inside]
+        del pixels
+
+    def draw_stamps(self, surface):
+        # Fallback for surfaces surfarray cannot address (e.g. 8/16-bit displays)
+        sequence = []
+        ys = self.y.astype(np.intp)
+        for radius, start, end in self.visible_layers():
+            for color_index, x, y in zip(self.color_index[start:end].tolist(), self.x[start:end].tolist(), ys[start:end].tolist()):
+                stamp = self.stamps.get((color_index, radius))
+                if stamp is None:
+                    stamp = pygame.Surface((radius*2 + 1, radius*2 + 1))
+                    pygame.draw.circle(stamp, STAR_COLORS[color_index], (radius, radius), radius)
+                    stamp.set_colorkey(BLACK)
+                    self.stamps[(color_index, radius)] = stamp
+                sequence.append((stamp, (x - radius, y - radius)))
+        surface.blits(sequence, doreturn=False)
+
+# Menu background: the static gradient and the nebula discs are rendered once and reused
+NEBULA_COLOR = (100, 50, 150)
+NEBULA_ALPHA_STEP = 4
+
+class MenuBackground:
+    def __init__(self):
+        self.gradient = None
+        self.nebulae = {}
+
+    def get_gradient(self):
+        if self.gradient is None:
+            gradient = pygame.Surface((WIDTH, HEIGHT))
+            for y in range(HEIGHT):
+                color_value = int(50 * (1 - y/HEIGHT))
+                color = (color_value, color_value, color_value + 50)
+                pygame.draw.line(gradient, color, (0, y), (WIDTH, y))
+            if pygame.display.get_surface() is not None:
+                gradient = gradient.convert()
+            self.gradient = gradient
+        return self.gradient
+
+    def get_nebula(self, radius, alpha):
+        # Uniform-alpha discs blit fastest as colour-keyed RLE surfaces with surface alpha
+        level = (alpha + NEBULA_ALPHA_STEP // 2) // NEBULA_ALPHA_STEP
+        nebula = self.nebulae.get((radius, level))
+        if nebula is None:
+            nebula = pygame.Surface((radius*2, radius*2))
+            if pygame.display.get_surface() is not None:
+                nebula = nebula.convert()
+            nebula.fill(BLACK)
+            pygame.draw.circle(nebula, NEBULA_COLOR, (radius, radius), radius)
+            nebula.set_colorkey(BLACK, pygame.RLEACCEL)
+            nebula.set_alpha(min(255, level * NEBULA_ALPHA_STEP), pygame.RLEACCEL)
+            self.nebulae[(radius, level)] = nebula
+        return nebula
+
+# Spatial hash broadphase
+COLLISION_CELL_SIZE = 64
+MAX_PROJECTILE_RADIUS = 4
+# Projectiles are looked up by the midpoint of their swept capsule, which lies within this
+# distance of any point the capsule covered during the tick
+MAX_PROJECTILE_REACH = MAX_PROJECTILE_RADIUS + (LASER_HEIGHT + LASER_SPEED) / 2
+SEGMENT_EPSILON = 1e-12
+CELL_KEY_STRIDE = 1 << 20
+CELL_KEY_WEIGHTS = np.array((CELL_KEY_STRIDE, 1), np.int64)
+
+def segment_distance_sq(p, d, q, e):
+    # Squared closest distance between segments p + s*d and q + t*e (s, t in [0, 1]) for each row
+    # of (n, 2) arrays; degenerate segments are points
+    r = p - q
+    a = np.einsum("ij,ij->i", d, d)
+    b = np.einsum("ij,ij->i", d, e)
+    c = np.einsum("ij,ij->i", d, r)
+    ee = np.einsum("ij,ij->i", e, e)
+    f = np.einsum("ij,ij->i", e, r)
+    moving = a > SEGMENT_EPSILON
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = a * ee - b * b
+        s = np.where(denom > SEGMENT_EPSILON, np.clip((b * f - c * ee) / denom, 0, 1),
+                     np.where(moving & (ee <= SEGMENT_EPSILON), np.clip(-c / a, 0, 1), 0.0))
+        t = np.where(ee > SEGMENT_EPSILON, (b * s + f) / ee, 0.0)
+        # Clamping t to its segment moves s to the closest point for that end
+        s = np.where(t < 0, np.where(moving, np.clip(-c / a, 0, 1), 0.0),
+                     np.where(t > 1, np.where(moving, np.clip((b - c) / a, 0, 1), 0.0), s))
+    t = np.clip(t, 0, 1)
+    delta = r + d * s[:, None] - e * t[:, None]
+    return np.einsum("ij,ij->i", delta, delta)
+
+class SpatialHash:
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, index, x, y, radius=0):
+        # Items land in every cell their bounding box touches, in insertion order
+        size = self.cell_size
+        cells = self.cells
+        for cx in range(int((x - radius) // size), int((x + radius) // size) + 1):
+            for cy in range(int((y - radius) // size), int((y + radius) // size) + 1):
+                key = cx * CELL_KEY_STRIDE + cy
+                bucket = cells.get(key)
+                if bucket is None:
+                    cells[key] = [index]
+                else:
+                    bucket.append(index)
+
+    def pairs(self, points):
+        # Candidate (point, item) index arrays for an (n, 2) array of points, ordered by point then item
+        keys = (np.floor_divide(points, self.cell_size).astype(np.int64) @ CELL_KEY_WEIGHTS).tolist()
+        lookup = self.cells.get
+        point_rows = []
+        item_rows = []
+        for row, key in enumerate(keys):
+            bucket = lookup(key)
+            if bucket:
+                point_rows += [row] * len(bucket)
+                item_rows += bucket
+        return np.array(point_rows, np.intp), np.array(item_rows, np.intp)
 
 # Game class
+UPGRADE_ORDER = ("speed", "health", "damage", "fire_rate")
+UPGRADE_SNAPSHOT = struct.Struct(f"<{len(UPGRADE_ORDER)}q")
+PRICE_SNAPSHOT = struct.Struct(f"<{len(UPGRADE_ORDER)}d")
+# Screens drawn over the animated menu background refresh their cached backdrop this often (in
+# frames); in between only changed buttons are repainted
+BACKDROP_REFRESH_FRAMES = 4
+ANIMATED_BACKDROPS = (GameState.UPGRADE_SHOP, GameState.SETTINGS, GameState.ABOUT, GameState.GAME_OVER)
+
 class Game:
-    def __init__(self):
+    def __init__(self, seed=None, balance=DEFAULT_BALANCE, budgets=None):
         self.state = GameState.MAIN_MENU
+        self.rng = GameRandom(seed)
+        self.balance = balance
+        self.budgets = dict(ENTITY_BUDGETS, **(budgets or {}))
+        self.recorder = None
+        self.record_path = None
+        self.missions_recorded = 0
         self.player = Player()
-        self.bullets = []
-        self.enemy_bullets = []
-        self.enemies = []
-        self.particles = []
-        self.power_ups = []
+        self.entities = EntityStore()
+        self.bullets = self.entities.add(Bullets(self.budgets["bullets"]))
+        self.enemy_bullets = self.entities.add(EnemyBullets(self.budgets["enemy_bullets"]))
+        self.enemies = self.entities.add(Enemies())
+        self.power_ups = self.entities.add(PowerUps(self.budgets["power_ups"]))
+        self.particles = ParticleSystem(self.budgets["particles"], rng=self.rng.effects)
         self.clock = pygame.time.Clock()
+        self.tick = 0
+        self.time_ms = 0
+        self.render_alpha = 1.0
         self.enemy_spawn_timer = 0
         self.level = 1
         self.score = 0
@@ -620,18 +2183,30 @@ class Game:
         self.wave_complete = False
         self.difficulty_timer = 0
         self.difficulty_interval = 10000
+        self.boss_kill_ticks = []
+        self.checkpoint = None
+        self.save_path = None
+        self.enemy_grid = SpatialHash()
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.profile_path = None
+        self.tracer = None
+        self.trace_path = None
+        self.first_frame_ms = None
+        self.windowed_size = (WIDTH, HEIGHT)
+        self.fullscreen = False
+        self.scaling = "nearest"
+        self.title_glow = {}
+        self.menu_background = MenuBackground()
+        self.hud_labels = {
+            "health": TextLabel(game_font, WHITE),
+            "weapon": TextLabel(game_font, CYAN),
+            "shield": TextLabel(game_font, BLUE)
+        }
+        self.hud_stat_labels = [TextLabel(game_font, WHITE) for _ in range(6)]
         
         # Enhanced background stars
-        self.stars = []
-        for _ in range(300):
-            star_color = random.choice([WHITE, LIGHT_BLUE, YELLOW, CYAN])
-            self.stars.append((
-                random.randint(0, WIDTH), 
-                random.randint(0, HEIGHT), 
-                random.randint(1, 3), 
-                random.random()*0.3,
-                star_color
-            ))
+        self.stars = Starfield()
         
         # Create icons for buttons
         self.icons = self.create_icons()
@@ -668,6 +2243,24 @@ class Game:
             Button(center_x, 440, button_width, button_height, "Fire Rate Upgrade", ORANGE, YELLOW),
             Button(center_x, 520, button_width, button_height, "Back to Menu", PURPLE, (255, 100, 255))
         ]
+        
+        self.about_buttons = [
+            Button(WIDTH//2 - 150, 530, 300, 50, "Back to Command Center", BLUE, PURPLE)
+        ]
+        
+        self.screen_buttons = {
+            GameState.MAIN_MENU: self.menu_buttons,
+            GameState.UPGRADE_SHOP: self.upgrade_buttons,
+            GameState.SETTINGS: self.settings_buttons,
+            GameState.ABOUT: self.about_buttons,
+            GameState.GAME_OVER: self.game_over_buttons,
+            GameState.PAUSED: self.pause_buttons
+        }
+        
+        # Dirty-rect state for static screens
+        self.static_key = None
+        self.static_backdrop = None
+        self.backdrop_age = 0
 
     def create_icons(self):
         icons = {}
@@ -698,13 +2291,34 @@ class Game:
         
         return icons
 
+    def set_budgets(self, budgets):
+        # Rows already live stay; the new limits apply from the next spawn
+        self.budgets = dict(ENTITY_BUDGETS, **budgets)
+        for name in ("bullets", "enemy_bullets", "power_ups"):
+            self.entities[name].limit = self.budgets[name]
+        if self.particles.capacity != self.budgets["particles"]:
+            self.particles = ParticleSystem(self.budgets["particles"], rng=self.rng.effects)
+
+    def upgrade_price(self, upgrade):
+        return self.balance.upgrade_price(upgrade, self.player.upgrades[upgrade])
+
+    def buy_upgrade(self, upgrade):
+        price = self.upgrade_price(upgrade)
+        if self.player.money < price:
+            return False
+        self.player.money -= price
+        self.player.upgrades[upgrade] += 1
+        if upgrade == "health":
+            self.player.max_health += 20
+            self.player.health = self.player.max_health
+        return True
+
     def reset_game(self):
         self.player = Player()
-        self.bullets = []
-        self.enemy_bullets = []
-        self.enemies = []
-        self.particles = []
-        self.power_ups = []
+        self.entities.clear()
+        self.particles.clear()
+        self.tick = 0
+        self.time_ms = 0
         self.enemy_spawn_timer = 0
         self.level = 1
         self.score = 0
@@ -717,49 +2331,157 @@ class Game:
         self.wave_enemies_spawned = 0
         self.wave_complete = False
         self.difficulty_timer = 0
+        self.boss_kill_ticks = []
+
+    def start_mission(self, seed=None):
+        # Every mission is a pure function of its seed and per-tick input
+        self.finish_recording()
+        self.rng.reseed(seed if seed is not None else self.rng.next_session_seed())
+        self.particles.rng = self.rng.effects
+        self.reset_game()
+        self.state = GameState.PLAYING
+        if self.record_path:
+            self.missions_recorded += 1
+            self.recorder = InputRecorder(self.rng.seed, self.budgets)
+
+    def recording_path(self):
+        # The first mission of a session records to record_path itself, later ones to
+        # numbered siblings (run.gdr, run-2.gdr, run-3.gdr, ...) so none overwrites another
+        if self.missions_recorded <= 1:
+            return self.record_path
+        root, ext = os.path.splitext(self.record_path)
+        return f"{root}-{self.missions_recorded}{ext}"
+
+    def finish_recording(self):
+        if self.recorder is not None and len(self.recorder):
+            path = self.recording_path()
+            self.recorder.save(path, self.state_digest())
+            print(f"Recorded {len(self.recorder)} ticks of mission {self.missions_recorded} to {path}")
+        self.recorder = None
+
+    def state_digest(self):
+        player = self.player
+        values = [self.tick, self.score, self.level, self.wave, self.enemies_killed_this_level,
+                  player.x, player.y, player.health, player.lives, player.money, player.shield]
+        enemies = self.enemies
+        values += np.column_stack((enemies.pos[:enemies.count], enemies.health[:enemies.count])).ravel().tolist()
+        values += self.bullets.pos[:self.bullets.count].ravel().tolist()
+        values += self.enemy_bullets.pos[:self.enemy_bullets.count].ravel().tolist()
+        power_ups = self.power_ups
+        values += np.column_stack((power_ups.pos[:power_ups.count], power_ups.kind[:power_ups.count])).ravel().tolist()
+        return zlib.crc32(struct.pack(f"<{len(values)}d", *values))
+
+    def snapshot(self):
+        # The whole simulation as bytes; a game restored from them carries on exactly as this one would
+        player = self.player
+        return b"".join([
+            SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION),
+            pack_budgets(self.budgets),
+            self.rng.dump(),
+            BALANCE_SNAPSHOT.pack(self.balance),
+            PRICE_SNAPSHOT.pack(*(self.balance.upgrade_prices[name] for name in UPGRADE_ORDER)),
+            GAME_SNAPSHOT.pack(self),
+            PLAYER_SNAPSHOT.pack(player),
+            UPGRADE_SNAPSHOT.pack(*(player.upgrades[name] for name in UPGRADE_ORDER)),
+            SNAPSHOT_COUNT.pack(len(self.boss_kill_ticks)),
+            np.array(self.boss_kill_ticks, np.int64).tobytes()
+        ] + [archetype.dump() for archetype in self.entities] + [self.particles.dump()])
+
+    def restore(self, data):
+        magic, version = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"not a version {SNAPSHOT_VERSION} snapshot")
+        # Input recorded so far still replays up to this point, so it is kept rather than lost
+        self.finish_recording()
+        self.set_budgets(unpack_budgets(data, SNAPSHOT_HEADER.size))
+        offset = self.rng.load(data, SNAPSHOT_HEADER.size + BUDGET_RECORD.size)
+        self.particles.rng = self.rng.effects
+        balance = self.balance = Balance()
+        offset = BALANCE_SNAPSHOT.unpack_into(balance, data, offset)
+        # Prices travel as doubles so tuned fractional prices survive; whole ones come back as ints
+        balance.upgrade_prices = {name: int(price) if price.is_integer() else price
+                                  for name, price in zip(UPGRADE_ORDER, PRICE_SNAPSHOT.unpack_from(data, offset))}
+        offset += PRICE_SNAPSHOT.size
+        offset = GAME_SNAPSHOT.unpack_into(self, data, offset)
+        player = self.player = Player()
+        offset = PLAYER_SNAPSHOT.unpack_into(player, data, offset)
+        player.upgrades = dict(zip(UPGRADE_ORDER, UPGRADE_SNAPSHOT.unpack_from(data, offset)))
+        offset += UPGRADE_SNAPSHOT.size
+        count, = SNAPSHOT_COUNT.unpack_from(data, offset)
+        offset += SNAPSHOT_COUNT.size
+        self.boss_kill_ticks = np.frombuffer(data, np.int64, count, offset).tolist()
+        offset += count * 8
+        for archetype in self.entities:
+            offset = archetype.load(data, offset)
+        for enemy in self.enemies.objects:
+            enemy.ai_rng = self.rng.enemy_ai
+        self.particles.load(data, offset)
+        self.static_key = None
+
+    def save_checkpoint(self):
+        self.checkpoint = self.snapshot()
+        if self.save_path:
+            with open(self.save_path, "wb") as f:
+                f.write(self.checkpoint)
+
+    def load_checkpoint(self):
+        if self.checkpoint is None and self.save_path and os.path.exists(self.save_path):
+            with open(self.save_path, "rb") as f:
+                self.checkpoint = f.read()
+        if self.checkpoint is not None:
+            self.restore(self.checkpoint)
+
+    def simulate(self, ticks, pilot=None):
+        # Headless fixed-timestep run: no display, no drawing, no frame pacing.
+        # pilot(game) returns the InputState for each tick; returns the number of ticks run.
+        for done in range(ticks):
+            if self.state == GameState.GAME_OVER:
+                return done
+            self.update(pilot(self) if pilot else NO_INPUT)
+        return ticks
 
     def spawn_enemy(self):
         if self.boss_active:
             return
             
         if self.wave_enemies_spawned < self.wave_size:
-            enemy_type_roll = random.random()
+            rng = self.rng.waves
+            balance = self.balance
+            enemy_type_roll = rng.random()
             enemy_type = EnemyType.BASIC
             
-            if self.level >= 8 and enemy_type_roll < 0.15:
+            if self.level >= 8 and enemy_type_roll < balance.shooter_roll:
                 enemy_type = EnemyType.SHOOTER
-            elif self.level >= 6 and enemy_type_roll < 0.25:
+            elif self.level >= 6 and enemy_type_roll < balance.tank_roll:
                 enemy_type = EnemyType.TANK
-            elif self.level >= 4 and enemy_type_roll < 0.35:
+            elif self.level >= 4 and enemy_type_roll < balance.fast_roll:
                 enemy_type = EnemyType.FAST
-            elif enemy_type_roll < 0.5:
+            elif enemy_type_roll < balance.basic_roll:
                 enemy_type = EnemyType.BASIC
             else:
                 if self.level >= 10:
-                    enemy_type = random.choice([EnemyType.FAST, EnemyType.SHOOTER, EnemyType.TANK])
+                    enemy_type = rng.choice([EnemyType.FAST, EnemyType.SHOOTER, EnemyType.TANK])
                 elif self.level >= 7:
-                    enemy_type = random.choice([EnemyType.FAST, EnemyType.SHOOTER])
+                    enemy_type = rng.choice([EnemyType.FAST, EnemyType.SHOOTER])
                 elif self.level >= 5:
-                    enemy_type = random.choice([EnemyType.FAST, EnemyType.BASIC])
+                    enemy_type = rng.choice([EnemyType.FAST, EnemyType.BASIC])
                 else:
                     enemy_type = EnemyType.BASIC
                     
-            self.enemies.append(Enemy(enemy_type, self.level))
+            Enemy(enemy_type, self.level, self.rng, self.enemies, balance)
             self.wave_enemies_spawned += 1
 
     def spawn_boss(self):
         if not self.boss_active:
             self.boss_active = True
-            boss = Enemy(EnemyType.BOSS, self.level)
+            boss = Enemy(EnemyType.BOSS, self.level, self.rng, self.enemies, self.balance)
             boss.x = WIDTH // 2
             boss.y = -100
-            self.enemies.append(boss)
             
-            for _ in range(100):
-                self.particles.append(Particle(WIDTH//2, 0, GOLD, size=random.randint(3, 8), life=random.randint(40, 80)))
+            self.particles.emit(WIDTH//2, 0, GOLD, 100, size=(3, 8), life=(40, 80))
 
     def spawn_power_up(self, x, y):
-        power_type_roll = random.random()
+        power_type_roll = self.rng.loot.random()
         
         if power_type_roll < 0.4:
             power_type = 1
@@ -772,136 +2494,184 @@ class Game:
         else:
             power_type = 3
             
-        self.power_ups.append(PowerUp(x, y, power_type))
+        self.power_ups.drop(x, y, power_type)
 
     def check_collisions(self):
-        # Bullet-enemy collisions
-        for bullet in self.bullets[:]:
-            for enemy in self.enemies[:]:
-                if hasattr(bullet, 'active') and not bullet.active:
+        # Batched passes over the component arrays; hits still resolve in spawn order,
+        # exactly as a full scan over every pair would.
+        enemies = self.enemies
+        bullets = self.bullets
+        objects = enemies.objects
+        player = self.player
+        killed = np.zeros(len(enemies), np.bool_)
+
+        # Bullet-enemy collisions: the grid picks out the shots whose sweep this tick may have
+        # crossed an enemy's, then every candidate pair gets a continuous test at once, so fast
+        # shots cannot tunnel through fast enemies between ticks
+        if len(bullets) and len(enemies):
+            enemy_grid = self.enemy_grid
+            enemy_grid.clear()
+            count = enemies.count
+            centers = (enemies.prev[:count] + enemies.pos[:count]) * 0.5
+            reaches = (enemies.radius[:count] + MAX_PROJECTILE_REACH
+                       + np.abs(enemies.pos[:count] - enemies.prev[:count]).max(axis=1) * 0.5)
+            for i, ((x, y), reach) in enumerate(zip(centers.tolist(), reaches.tolist())):
+                enemy_grid.insert(i, x, y, reach)
+            
+            count = bullets.count
+            midpoints = (bullets.prev[:count] + bullets.pos[:count]) * 0.5
+            midpoints[:, 1] += bullets.length[:count] * 0.5
+            bullet_rows, enemy_rows = enemy_grid.pairs(midpoints)
+            if len(bullet_rows):
+                # In each shot's frame the enemy centre moves along a segment; it hits when that
+                # segment passes within reach of the shot's axis
+                start = enemies.prev[enemy_rows] - bullets.prev[bullet_rows]
+                path = enemies.pos[enemy_rows] - bullets.pos[bullet_rows] - start
+                axis = np.zeros_like(start)
+                axis[:, 1] = bullets.length[bullet_rows]
+                reach = enemies.radius[enemy_rows] + bullets.radius[bullet_rows]
+                hit = segment_distance_sq(start, path, np.zeros_like(start), axis) < reach * reach
+                bullet_rows, enemy_rows = bullet_rows[hit], enemy_rows[hit]
+            
+            spent = np.zeros(len(bullets), np.bool_)
+            for b, i in zip(bullet_rows.tolist(), enemy_rows.tolist()):
+                if spent[b] or killed[i]:
                     continue
-                    
-                distance = math.sqrt((bullet.x - enemy.x)**2 + (bullet.y - enemy.y)**2)
-                collision_distance = enemy.width//2 + (bullet.radius if hasattr(bullet, 'radius') else bullet.width//2)
+                enemy = objects[i]
+                enemy.health -= bullets.damage[b]
+                enemy.hit_effect = 10
+                
+                self.particles.emit(enemy.x, enemy.y, enemy.color, 5)
                 
-                if distance < collision_distance:
-                    enemy.health -= bullet.damage
-                    enemy.hit_effect = 10
+                if enemy.health <= 0:
+                    self.particles.emit(enemy.x, enemy.y, RED, 20)
+                    self.particles.emit(enemy.x, enemy.y, YELLOW, 10)
                     
-                    for _ in range(5):
-                        self.particles.append(Particle(enemy.x, enemy.y, enemy.color))
+                    if self.rng.loot.random() < 0.3:
+                        self.spawn_power_up(enemy.x, enemy.y)
                     
-                    if enemy.health <= 0:
-                        for _ in range(20):
-                            self.particles.append(Particle(enemy.x, enemy.y, RED))
-                        for _ in range(10):
-                            self.particles.append(Particle(enemy.x, enemy.y, YELLOW))
-                        
-                        if random.random() < 0.3:
-                            self.spawn_power_up(enemy.x, enemy.y)
-                        
-                        self.score += enemy.value
-                        self.player.kill_count += 1
-                        self.player.money += enemy.value // 5
-                        self.enemies_killed_this_level += 1
-                        
-                        if enemy.type == EnemyType.BOSS:
-                            self.boss_active = False
-                            self.level += 1
-                            self.state = GameState.LEVEL_TRANSITION
-                            self.level_transition_timer = 180
-                            self.wave = 1
-                            self.wave_size = 5 + self.level
-                            self.wave_enemies_spawned = 0
-                            self.wave_complete = False
-                            self.enemies_killed_this_level = 0
-                            self.enemies_needed_for_boss = 15 + (self.level * 2)
-                        
-                        self.enemies.remove(enemy)
+                    self.score += enemy.value
+                    self.player.kill_count += 1
+                    self.player.money += enemy.value // 5
+                    self.enemies_killed_this_level += 1
                     
-                    if hasattr(bullet, 'active'):
-                        bullet.active = False
-                    else:
-                        if bullet in self.bullets:
-                            self.bullets.remove(bullet)
-                    break
+                    if enemy.type == EnemyType.BOSS:
+                        self.boss_kill_ticks.append(self.tick)
+                        self.boss_active = False
+                        self.level += 1
+                        self.state = GameState.LEVEL_TRANSITION
+                        self.level_transition_timer = 180
+                        self.wave = 1
+                        self.wave_size = 5 + self.level
+                        self.wave_enemies_spawned = 0
+                        self.wave_complete = False
+                        self.enemies_killed_this_level = 0
+                        self.enemies_needed_for_boss = 15 + (self.level * 2)
+                    
+                    killed[i] = True
+                
+                spent[b] = True
+            
+            if spent.any():
+                bullets.remove(spent)
 
         # Player-enemy collisions
-        for enemy in self.enemies[:]:
-            if self.player.invincible > 0:
-                continue
-                
-            distance = math.sqrt((self.player.x - enemy.x)**2 + (self.player.y - enemy.y)**2)
-            if distance < enemy.width//2 + self.player.width//2:
-                for _ in range(30):
-                    self.particles.append(Particle(enemy.x, enemy.y, RED))
+        reach = player.width//2
+        if len(enemies) and player.invincible <= 0:
+            limit = enemies.radius[:enemies.count] + reach
+            touching = (enemies.distance_sq(player.x, player.y) < limit * limit) & ~killed
+            for i in np.flatnonzero(touching).tolist():
+                if player.invincible > 0:
+                    break
+                enemy = objects[i]
+                self.particles.emit(enemy.x, enemy.y, RED, 30)
                 
-                self.enemies.remove(enemy)
-                self.player.take_damage(10 if enemy.type != EnemyType.BOSS else 25)
+                killed[i] = True
+                player.take_damage(int(enemies.damage[i]))
                 
-                if self.player.health <= 0:
-                    self.player.lives -= 1
-                    if self.player.lives <= 0:
+                if player.health <= 0:
+                    player.lives -= 1
+                    if player.lives <= 0:
                         self.state = GameState.GAME_OVER
                     else:
-                        self.player.health = self.player.max_health
+                        player.health = player.max_health
+
+        if killed.any():
+            enemies.remove(killed)
 
         # Player-enemy bullet collisions
-        for bullet in self.enemy_bullets[:]:
-            if self.player.invincible > 0:
-                continue
-                
-            distance = math.sqrt((self.player.x - bullet.x)**2 + (self.player.y - bullet.y)**2)
-            if distance < self.player.width//2 + bullet.radius:
-                self.enemy_bullets.remove(bullet)
-                self.player.take_damage(5)
-                
-                if self.player.health <= 0:
-                    self.player.lives -= 1
-                    if self.player.lives <= 0:
-                        self.state = GameState.GAME_OVER
-                    else:
-                        self.player.health = self.player.max_health
+        enemy_bullets = self.enemy_bullets
+        if player.invincible <= 0 and len(enemy_bullets):
+            # Shots near the ship now get a swept test against its motion this tick
+            limit = enemy_bullets.radius[:enemy_bullets.count] + reach
+            margin = limit + ENEMY_BULLET_SPEED + math.hypot(player.x - player.prev_x, player.y - player.prev_y)
+            hits = np.flatnonzero(enemy_bullets.distance_sq(player.x, player.y) < margin * margin)
+            if len(hits):
+                swept = enemy_bullets.swept_distance_sq(hits, player.prev_x, player.prev_y, player.x, player.y)
+                hits = hits[swept < limit[hits] * limit[hits]]
+            if len(hits):
+                spent = np.zeros(len(enemy_bullets), np.bool_)
+                for row in hits.tolist():
+                    if player.invincible > 0:
+                        break
+                    spent[row] = True
+                    player.take_damage(int(enemy_bullets.damage[row]))
+                    
+                    if player.health <= 0:
+                        player.lives -= 1
+                        if player.lives <= 0:
+                            self.state = GameState.GAME_OVER
+                        else:
+                            player.health = player.max_health
+                enemy_bullets.remove(spent)
 
         # Player-power-up collisions
-        for power_up in self.power_ups[:]:
-            distance = math.sqrt((self.player.x - power_up.x)**2 + (self.player.y - power_up.y)**2)
-            if distance < power_up.radius + self.player.width//2:
-                if power_up.type == 1:
-                    self.player.health = min(self.player.max_health, self.player.health + 30)
-                elif power_up.type == 2:
-                    weapons = [WeaponType.SINGLE, WeaponType.DOUBLE, WeaponType.TRIPLE, WeaponType.SPREAD, WeaponType.LASER]
-                    current_index = list(weapons).index(self.player.weapon_type) if self.player.weapon_type in weapons else 0
-                    self.player.weapon_type = weapons[(current_index + 1) % len(weapons)]
-                elif power_up.type == 3:
-                    self.player.lives += 1
-                elif power_up.type == 4:
-                    self.player.shield = 50
-                elif power_up.type == 5:
-                    self.player.money += 25
-                
-                self.power_ups.remove(power_up)
-
-    def update(self):
+        power_ups = self.power_ups
+        if len(power_ups):
+            limit = power_ups.radius[:power_ups.count] + reach
+            collected = power_ups.distance_sq(player.x, player.y) < limit * limit
+            if collected.any():
+                for power_type in power_ups.kind[:power_ups.count][collected].tolist():
+                    if power_type == 1:
+                        player.health = min(player.max_health, player.health + 30)
+                    elif power_type == 2:
+                        weapons = [WeaponType.SINGLE, WeaponType.DOUBLE, WeaponType.TRIPLE, WeaponType.SPREAD, WeaponType.LASER]
+                        current_index = list(weapons).index(player.weapon_type) if player.weapon_type in weapons else 0
+                        player.weapon_type = weapons[(current_index + 1) % len(weapons)]
+                    elif power_type == 3:
+                        player.lives += 1
+                    elif power_type == 4:
+                        player.shield = 50
+                    elif power_type == 5:
+                        player.money += 25
+                power_ups.remove(collected)
+
+    def update(self, inputs=NO_INPUT):
+        if self.recorder is not None and self.state in (GameState.PLAYING, GameState.LEVEL_TRANSITION):
+            self.recorder.record(inputs)
+            
         if self.state == GameState.PLAYING:
+            self.tick += 1
+            self.time_ms = self.tick * TICK_MS
+            
             # Progressive difficulty
-            self.difficulty_timer += self.clock.get_time()
+            self.difficulty_timer += TICK_MS
             if self.difficulty_timer > self.difficulty_interval:
                 self.difficulty_timer = 0
-                for enemy in self.enemies:
+                for enemy in self.enemies.objects:
                     enemy.speed *= 1.05
                     enemy.shoot_chance = min(0.3, enemy.shoot_chance * 1.1)
 
             # Player movement
-            keys = pygame.key.get_pressed()
-            self.player.move(keys)
+            self.player.move(inputs)
             
             # Auto-shooting
-            if keys[pygame.K_SPACE]:
-                self.player.shoot(self.bullets)
+            if inputs.fire:
+                self.player.shoot(self.bullets, self.time_ms)
             
             if self.player.power_timer > 0:
-                self.player.power_timer -= self.clock.get_time()
+                self.player.power_timer -= TICK_MS
+            self.profiler.lap("update.player")
 
             # Enemy spawning logic
             if not self.boss_active:
@@ -920,116 +2690,101 @@ class Game:
                     self.wave_size = 5 + self.level + (self.wave * 2)
                     self.wave_enemies_spawned = 0
                     self.wave_complete = False
+            self.profiler.lap("update.spawning")
 
-            # Update bullets
-            for bullet in self.bullets[:]:
-                bullet.update()
-                if hasattr(bullet, 'active') and not bullet.active:
-                    self.bullets.remove(bullet)
-                elif bullet.y < 0 or bullet.y > HEIGHT or bullet.x < 0 or bullet.x > WIDTH:
-                    self.bullets.remove(bullet)
-
-            # Update enemy bullets
-            for bullet in self.enemy_bullets[:]:
-                bullet.update()
-                if bullet.y > HEIGHT or bullet.x < 0 or bullet.x > WIDTH:
-                    self.enemy_bullets.remove(bullet)
+            # Move and cull projectiles
+            self.bullets.update()
+            self.enemy_bullets.update()
+            self.profiler.lap("update.projectiles")
 
             # Update enemies
-            for enemy in self.enemies[:]:
-                enemy.update()
-                enemy.shoot(self.enemy_bullets)
-                
-                if enemy.y > HEIGHT + 100:
-                    self.enemies.remove(enemy)
-                    if not self.boss_active:
-                        self.player.health -= 5
+            escaped = self.enemies.update(self.time_ms, self.enemy_bullets)
+            if escaped and not self.boss_active:
+                self.player.health -= 5 * escaped
+            self.profiler.lap("update.enemies")
 
             # Update power-ups
-            for power_up in self.power_ups[:]:
-                power_up.update()
-                if power_up.y > HEIGHT + 50:
-                    self.power_ups.remove(power_up)
+            self.power_ups.update()
+            self.profiler.lap("update.power_ups")
 
             # Update particles
-            for particle in self.particles[:]:
-                particle.update()
-                if particle.life <= 0:
-                    self.particles.remove(particle)
+            self.particles.update()
+            self.profiler.lap("update.particles")
 
             # Check collisions
             self.check_collisions()
+            self.profiler.lap("update.collisions")
 
         elif self.state == GameState.LEVEL_TRANSITION:
+            self.tick += 1
+            self.time_ms = self.tick * TICK_MS
             self.level_transition_timer -= 1
             if self.level_transition_timer <= 0:
                 self.state = GameState.PLAYING
 
     def draw_beautiful_menu_background(self):
-        for y in range(HEIGHT):
-            color_value = int(50 * (1 - y/HEIGHT))
-            color = (color_value, color_value, color_value + 50)
-            pygame.draw.line(screen, color, (0, y), (WIDTH, y))
+        background = self.menu_background
+        screen.blit(background.get_gradient(), (0, 0))
         
-        for i, (x, y, size, speed, color) in enumerate(self.stars):
-            pygame.draw.circle(screen, color, (int(x), int(y)), size)
-            self.stars[i] = (x, (y + speed) % HEIGHT, size, speed, color)
+        self.stars.draw(screen)
+        self.stars.update()
         
+        ticks = wall_ms()
         for i in range(5):
-            alpha = int(50 + 20 * math.sin(pygame.time.get_ticks() * 0.001 + i))
+            alpha = int(50 + 20 * math.sin(ticks * 0.001 + i))
             radius = 100 + i * 30
-            x = WIDTH//2 + math.cos(pygame.time.get_ticks() * 0.0005 + i) * 50
-            y = HEIGHT//3 + math.sin(pygame.time.get_ticks() * 0.0007 + i) * 30
+            x = WIDTH//2 + math.cos(ticks * 0.0005 + i) * 50
+            y = HEIGHT//3 + math.sin(ticks * 0.0007 + i) * 30
             
-            nebula_surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(nebula_surf, (100, 50, 150, alpha), (radius, radius), radius)
-            screen.blit(nebula_surf, (x - radius, y - radius))
+            screen.blit(background.get_nebula(radius, alpha), (x - radius, y - radius))
+
+    def get_title_glow(self, glow_steps):
+        # The glow layers for each step count are composited once and reused
+        frame = self.title_glow.get(glow_steps)
+        if frame is None:
+            title_text = text_cache.render(title_font, "GALAXY DEFENDER", True, CYAN)
+            frame = pygame.Surface(title_text.get_size(), pygame.SRCALPHA)
+            for i in range(glow_steps, 0, -1):
+                alpha = 100 - i * (100 // glow_steps)
+                frame.blit(title_font.render("GALAXY DEFENDER", True, (0, 255, 255, alpha)), (0, 0))
+            frame.blit(title_text, (0, 0))
+            self.title_glow[glow_steps] = frame
+        return frame
 
     def draw_main_menu(self):
         self.draw_beautiful_menu_background()
         
-        glow_size = 5 + 3 * math.sin(pygame.time.get_ticks() * 0.005)
-        title_text = title_font.render("GALAXY DEFENDER", True, CYAN)
-        
-        for i in range(int(glow_size), 0, -1):
-            alpha = 100 - i * (100 // int(glow_size))
-            glow_text = title_font.render("GALAXY DEFENDER", True, (0, 255, 255, alpha))
-            glow_rect = glow_text.get_rect(center=(WIDTH//2, 100))
-            screen.blit(glow_text, glow_rect)
-        
+        glow_size = 5 + 3 * math.sin(wall_ms() * 0.005)
+        title_text = self.get_title_glow(int(glow_size))
         title_rect = title_text.get_rect(center=(WIDTH//2, 100))
         screen.blit(title_text, title_rect)
         
-        subtitle_text = menu_font.render("Ultimate Space Shooter", True, YELLOW)
+        subtitle_text = text_cache.render(menu_font, "Ultimate Space Shooter", True, YELLOW)
         subtitle_rect = subtitle_text.get_rect(center=(WIDTH//2, 160))
         screen.blit(subtitle_text, subtitle_rect)
         
-        for button in self.menu_buttons:
-            button.draw(screen)
-        
-        high_score_text = game_font.render(f"High Score: {self.score}", True, YELLOW)
+        high_score_text = text_cache.render(game_font, f"High Score: {self.score}", True, YELLOW)
         screen.blit(high_score_text, (WIDTH//2 - high_score_text.get_width()//2, 550))
 
     def draw_upgrade_shop(self):
         self.draw_beautiful_menu_background()
         
-        title_text = title_font.render("UPGRADE HANGAR", True, GOLD)
+        title_text = text_cache.render(title_font, "UPGRADE HANGAR", True, GOLD)
         screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 50))
         
-        money_text = menu_font.render(f"Space Credits: ${self.player.money}", True, YELLOW)
+        money_text = text_cache.render(menu_font, f"Space Credits: ${self.player.money}", True, YELLOW)
         screen.blit(money_text, (WIDTH//2 - money_text.get_width()//2, 120))
         
         upgrade_info = [
-            ("Speed", self.player.upgrades["speed"], 100 * (2 ** (self.player.upgrades["speed"] - 1))),
-            ("Health", self.player.upgrades["health"], 100 * (2 ** (self.player.upgrades["health"] - 1))),
-            ("Damage", self.player.upgrades["damage"], 150 * (2 ** (self.player.upgrades["damage"] - 1))),
-            ("Fire Rate", self.player.upgrades["fire_rate"], 120 * (2 ** (self.player.upgrades["fire_rate"] - 1))),
+            ("Speed", self.player.upgrades["speed"], self.upgrade_price("speed")),
+            ("Health", self.player.upgrades["health"], self.upgrade_price("health")),
+            ("Damage", self.player.upgrades["damage"], self.upgrade_price("damage")),
+            ("Fire Rate", self.player.upgrades["fire_rate"], self.upgrade_price("fire_rate")),
         ]
         
         for i, (name, level, price) in enumerate(upgrade_info):
             button = self.upgrade_buttons[i]
             button.text = f"{name} Upgrade (Lvl {level}) - ${price}"
-            button.draw(screen)
             
             stat_value = ""
             if name == "Speed":
@@ -1041,34 +2796,29 @@ class Game:
             elif name == "Fire Rate":
                 stat_value = f"Current: {200 - (level * 20)}ms"
                 
-            value_text = small_font.render(stat_value, True, WHITE)
+            value_text = text_cache.render(small_font, stat_value, True, WHITE)
             screen.blit(value_text, (button.rect.right + 10, button.rect.centery - value_text.get_height()//2))
             
             if self.player.money >= price:
-                afford_text = small_font.render("CAN AFFORD", True, GREEN)
+                afford_text = text_cache.render(small_font, "CAN AFFORD", True, GREEN)
             else:
-                afford_text = small_font.render("INSUFFICIENT FUNDS", True, RED)
+                afford_text = text_cache.render(small_font, "INSUFFICIENT FUNDS", True, RED)
             
             screen.blit(afford_text, (button.rect.right + 10, button.rect.centery + 15))
-        
-        self.upgrade_buttons[4].draw(screen)
 
     def draw_settings(self):
         self.draw_beautiful_menu_background()
         
-        title_text = title_font.render("SETTINGS", True, CYAN)
+        title_text = text_cache.render(title_font, "SETTINGS", True, CYAN)
         screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 80))
         
         sound_status = "ON" if self.sound_manager.sounds_enabled else "OFF"
         self.settings_buttons[0].text = f"Sound Effects: {sound_status}"
-        
-        for button in self.settings_buttons:
-            button.draw(screen)
 
     def draw_about(self):
         self.draw_beautiful_menu_background()
         
-        title_text = title_font.render("MISSION BRIEFING", True, CYAN)
+        title_text = text_cache.render(title_font, "MISSION BRIEFING", True, CYAN)
         screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 80))
         
         about_lines = [
@@ -1090,41 +2840,38 @@ class Game:
         
         for i, line in enumerate(about_lines):
             color = YELLOW if line.startswith("GALAXY") else CYAN if line.startswith("ENEMY") or line.startswith("CONTROLS") else WHITE
-            text = small_font.render(line, True, color)
+            text = text_cache.render(small_font, line, True, color)
             screen.blit(text, (WIDTH//2 - text.get_width()//2, 150 + i * 25))
-        
-        back_button = Button(WIDTH//2 - 150, 530, 300, 50, "Back to Command Center", BLUE, PURPLE)
-        back_button.draw(screen)
 
     def draw_game(self):
         screen.fill(BLACK)
         
-        for i, (x, y, size, speed, color) in enumerate(self.stars):
-            pygame.draw.circle(screen, color, (int(x), int(y)), size)
-            if self.state == GameState.PLAYING:
-                self.stars[i] = (x, (y + speed) % HEIGHT, size, speed, color)
+        self.stars.draw(screen)
+        if self.state == GameState.PLAYING:
+            self.stars.update()
+        profiler = self.profiler
+        profiler.lap("draw.background")
 
-        for particle in self.particles:
-            particle.draw()
+        self.particles.draw(screen)
+        profiler.lap("draw.particles")
         
-        for enemy in self.enemies:
-            enemy.draw()
-        
-        for bullet in self.bullets:
-            bullet.draw()
-            
-        for bullet in self.enemy_bullets:
-            bullet.draw()
+        alpha = self.render_alpha
+        for enemy in self.enemies.objects:
+            enemy.draw(alpha)
+        profiler.lap("draw.enemies")
         
-        for power_up in self.power_ups:
-            power_up.draw()
+        self.bullets.draw(screen, alpha)
+        profiler.lap("draw.bullets")
+        self.enemy_bullets.draw(screen, alpha)
+        profiler.lap("draw.enemy_bullets")
+        self.power_ups.draw(screen, alpha)
+        profiler.lap("draw.power_ups")
         
-        self.player.draw()
+        self.player.draw(alpha)
+        profiler.lap("draw.player")
 
         # Draw UI
-        ui_bg = pygame.Surface((250, 200), pygame.SRCALPHA)
-        ui_bg.fill((0, 0, 0, 150))
-        screen.blit(ui_bg, (5, 5))
+        screen.blit(surface_cache.fill((250, 200), (0, 0, 0, 150)), (5, 5))
         
         health_ratio = self.player.health / self.player.max_health
         health_width = 200 * health_ratio
@@ -1134,7 +2881,7 @@ class Game:
         pygame.draw.rect(screen, health_color, (15, 15, health_width, 20))
         pygame.draw.rect(screen, WHITE, (15, 15, 200, 20), 2)
         
-        health_text = game_font.render(f"SHIELD: {self.player.health}/{self.player.max_health}", True, WHITE)
+        health_text = self.hud_labels["health"].render(f"SHIELD: {self.player.health}/{self.player.max_health}")
         screen.blit(health_text, (20, 40))
         
         stats = [
@@ -1147,7 +2894,7 @@ class Game:
         ]
         
         for i, stat in enumerate(stats):
-            text = game_font.render(stat, True, WHITE)
+            text = self.hud_stat_labels[i].render(stat)
             screen.blit(text, (15, 70 + i * 25))
         
         weapon_names = {
@@ -1158,36 +2905,33 @@ class Game:
             WeaponType.LASER: "BEAM CANNON"
         }
         
-        weapon_text = game_font.render(f"WEAPON: {weapon_names[self.player.weapon_type]}", True, CYAN)
+        weapon_text = self.hud_labels["weapon"].render(f"WEAPON: {weapon_names[self.player.weapon_type]}")
         screen.blit(weapon_text, (WIDTH - weapon_text.get_width() - 15, 15))
         
         if self.player.shield > 0:
-            shield_text = game_font.render(f"SHIELD: {self.player.shield}", True, BLUE)
+            shield_text = self.hud_labels["shield"].render(f"SHIELD: {self.player.shield}")
             screen.blit(shield_text, (WIDTH - shield_text.get_width() - 15, 45))
         
         if self.boss_active:
-            warning_alpha = int(128 + 127 * math.sin(pygame.time.get_ticks() * 0.01))
-            warning_surf = pygame.Surface((WIDTH, 60), pygame.SRCALPHA)
-            warning_surf.fill((255, 0, 0, warning_alpha))
-            screen.blit(warning_surf, (0, HEIGHT//2 - 30))
+            warning_alpha = int(128 + 127 * math.sin(wall_ms() * 0.01))
+            screen.blit(surface_cache.fill((WIDTH, 60), (255, 0, 0, warning_alpha)), (0, HEIGHT//2 - 30))
             
-            warning_text = title_font.render("MOTHERSHIP INCOMING!", True, WHITE)
+            warning_text = text_cache.render(title_font, "MOTHERSHIP INCOMING!", True, WHITE)
             screen.blit(warning_text, (WIDTH//2 - warning_text.get_width()//2, HEIGHT//2 - 25))
+        profiler.lap("draw.hud")
 
     def draw_level_transition(self):
         self.draw_game()
         
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        screen.blit(surface_cache.fill((WIDTH, HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-        level_text = title_font.render(f"LEVEL {self.level} COMPLETE!", True, YELLOW)
+        level_text = text_cache.render(title_font, f"LEVEL {self.level} COMPLETE!", True, YELLOW)
         screen.blit(level_text, (WIDTH//2 - level_text.get_width()//2, HEIGHT//2 - 80))
         
-        stats_text = menu_font.render(f"Score: {self.score}  Credits: ${self.player.money}", True, WHITE)
+        stats_text = text_cache.render(menu_font, f"Score: {self.score}  Credits: ${self.player.money}", True, WHITE)
         screen.blit(stats_text, (WIDTH//2 - stats_text.get_width()//2, HEIGHT//2 - 10))
         
-        next_level_text = menu_font.render(f"Next Mission: LEVEL {self.level + 1}", True, GREEN)
+        next_level_text = text_cache.render(menu_font, f"Next Mission: LEVEL {self.level + 1}", True, GREEN)
         screen.blit(next_level_text, (WIDTH//2 - next_level_text.get_width()//2, HEIGHT//2 + 40))
         
         progress = 1.0 - (self.level_transition_timer / 180)
@@ -1198,32 +2942,29 @@ class Game:
     def draw_game_over(self):
         self.draw_beautiful_menu_background()
         
-        title_text = title_font.render("MISSION FAILED", True, RED)
+        title_text = text_cache.render(title_font, "MISSION FAILED", True, RED)
         screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 150))
         
-        score_text = menu_font.render(f"Final Score: {self.score}", True, YELLOW)
+        score_text = text_cache.render(menu_font, f"Final Score: {self.score}", True, YELLOW)
         screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, 250))
         
-        level_text = menu_font.render(f"Level Reached: {self.level}", True, CYAN)
+        level_text = text_cache.render(menu_font, f"Level Reached: {self.level}", True, CYAN)
         screen.blit(level_text, (WIDTH//2 - level_text.get_width()//2, 300))
-        
-        for button in self.game_over_buttons:
-            button.draw(screen)
 
     def draw_pause(self):
         self.draw_game()
         
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        screen.blit(surface_cache.fill((WIDTH, HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-        pause_text = title_font.render("MISSION PAUSED", True, YELLOW)
+        pause_text = text_cache.render(title_font, "MISSION PAUSED", True, YELLOW)
         screen.blit(pause_text, (WIDTH//2 - pause_text.get_width()//2, 150))
-        
-        for button in self.pause_buttons:
-            button.draw(screen)
 
     def draw(self):
+        self.draw_screen()
+        for button in self.screen_buttons.get(self.state, ()):
+            button.draw(screen)
+
+    def draw_screen(self):
         if self.state == GameState.MAIN_MENU:
             self.draw_main_menu()
         elif self.state == GameState.SETTINGS:
@@ -1241,16 +2982,118 @@ class Game:
         elif self.state == GameState.UPGRADE_SHOP:
             self.draw_upgrade_shop()
 
+    def get_static_key(self):
+        # Screens whose content only changes on input; the key captures everything their backdrop shows
+        if self.state == GameState.UPGRADE_SHOP:
+            return (self.state, self.player.money, tuple(self.player.upgrades.values()))
+        elif self.state == GameState.SETTINGS:
+            return (self.state, self.sound_manager.sounds_enabled)
+        elif self.state == GameState.GAME_OVER:
+            return (self.state, self.score, self.level)
+        elif self.state in (GameState.ABOUT, GameState.PAUSED):
+            return (self.state,)
+        return None
+
+    def compose_frame(self):
+        # Draws the next frame and returns the screen regions that changed,
+        # or None when the whole frame has to be presented.
+        key = self.get_static_key()
+        if key is None:
+            self.static_key = None
+            self.draw()
+            return None
+        
+        buttons = self.screen_buttons[self.state]
+        self.backdrop_age += 1
+        refresh = self.state in ANIMATED_BACKDROPS and self.backdrop_age >= BACKDROP_REFRESH_FRAMES
+        if key != self.static_key or refresh:
+            # The backdrop is drawn once and buttons repaint over it. Menu-style screens redraw it
+            # every few frames to keep the starfield moving; drawing advances the stars one
+            # step, so they first catch up on the frames in between.
+            if key == self.static_key:
+                self.stars.update(self.backdrop_age - 1)
+            self.static_key = key
+            self.backdrop_age = 0
+            self.draw_screen()
+            self.static_backdrop = screen.copy()
+            for button in buttons:
+                button.draw(screen)
+            return None
+        
+        dirty = []
+        for button in buttons:
+            if button.is_dirty():
+                area = button.drawn_rect
+                screen.blit(self.static_backdrop, area, area)
+                button.draw(screen)
+                dirty.append(area.union(button.drawn_rect))
+        return dirty
+
+    def entity_counts(self):
+        return {
+            "enemies": len(self.enemies),
+            "bullets": len(self.bullets),
+            "enemy_bullets": len(self.enemy_bullets),
+            "power_ups": len(self.power_ups),
+            "particles": len(self.particles),
+            "shed": self.shed_count()
+        }
+
+    def reuse_rates(self):
+        return {"bullets": self.bullets.reuse_rate, "enemy_bullets": self.enemy_bullets.reuse_rate}
+
+    def shed_count(self):
+        # Spawns refused or particles evicted because a category hit its budget, since startup
+        return sum(archetype.dropped for archetype in self.entities) + self.particles.evicted
+
+    def entity_stats(self):
+        stats = self.entities.stats()
+        stats["particles"] = self.particles.stats()
+        return stats
+
     def run(self):
+        create_display(self.windowed_size, self.fullscreen, self.scaling)
+        if self.profile_path:
+            self.profiler.record()
+        if self.trace_path:
+            self.tracer = SpanTracer(self.trace_path).start()
+        try:
+            self.run_loop()
+        finally:
+            self.finish_recording()
+            if self.tracer is not None:
+                self.tracer.stop()
+                print(f"Wrote {self.tracer.events} trace events to {self.trace_path}")
+                self.tracer = None
+            if self.profile_path:
+                frames = self.profiler.export(self.profile_path)
+                print(f"Wrote {frames} profiled frames to {self.profile_path}")
+
+    def run_loop(self):
         running = True
+        accumulator = 0.0
+        previous = time.perf_counter()
+        tracer = self.tracer
+        traced_state = None
         while running:
-            mouse_pos = pygame.mouse.get_pos()
+            frame_start = time.perf_counter()
+            self.profiler.begin_frame()
+            mouse_pos = window_to_logical(pygame.mouse.get_pos())
             mouse_click = False
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    self.static_key = None
+                
+                if event.type == pygame.VIDEORESIZE:
+                    if not self.fullscreen:
+                        self.windowed_size = event.size
+                    layout_display()
+                    self.static_key = None
+                
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
                         mouse_click = True
@@ -1266,14 +3109,29 @@ class Game:
                         self.state = GameState.PAUSED
                     elif event.key == pygame.K_p and self.state == GameState.PAUSED:
                         self.state = GameState.PLAYING
+                    
+                    if event.key == pygame.K_F11:
+                        self.fullscreen = not self.fullscreen
+                        set_display_mode(self.windowed_size, self.fullscreen)
+                        self.static_key = None
+                    
+                    if event.key == pygame.K_F5 and self.state in (GameState.PLAYING, GameState.PAUSED,
+                                                                   GameState.LEVEL_TRANSITION):
+                        self.save_checkpoint()
+                    elif event.key == pygame.K_F9:
+                        self.load_checkpoint()
+                    
+                    if event.key == pygame.K_F3:
+                        self.show_profiler = not self.show_profiler
+                        self.profiler.set_enabled(self.show_profiler)
+                        self.static_key = None
             
             if self.state == GameState.MAIN_MENU:
                 for i, button in enumerate(self.menu_buttons):
                     button.check_hover(mouse_pos)
                     if button.is_clicked(mouse_pos, mouse_click):
                         if i == 0:
-                            self.reset_game()
-                            self.state = GameState.PLAYING
+                            self.start_mission()
                         elif i == 1:
                             self.state = GameState.UPGRADE_SHOP
                         elif i == 2:
@@ -1285,28 +3143,8 @@ class Game:
                 for i, button in enumerate(self.upgrade_buttons):
                     button.check_hover(mouse_pos)
                     if button.is_clicked(mouse_pos, mouse_click):
-                        if i == 0:
-                            price = 100 * (2 ** (self.player.upgrades["speed"] - 1))
-                            if self.player.money >= price:
-                                self.player.money -= price
-                                self.player.upgrades["speed"] += 1
-                        elif i == 1:
-                            price = 100 * (2 ** (self.player.upgrades["health"] - 1))
-                            if self.player.money >= price:
-                                self.player.money -= price
-                                self.player.upgrades["health"] += 1
-                                self.player.max_health += 20
-                                self.player.health = self.player.max_health
-                        elif i == 2:
-                            price = 150 * (2 ** (self.player.upgrades["damage"] - 1))
-                            if self.player.money >= price:
-                                self.player.money -= price
-                                self.player.upgrades["damage"] += 1
-                        elif i == 3:
-                            price = 120 * (2 ** (self.player.upgrades["fire_rate"] - 1))
-                            if self.player.money >= price:
-                                self.player.money -= price
-                                self.player.upgrades["fire_rate"] += 1
+                        if i < len(UPGRADE_ORDER):
+                            self.buy_upgrade(UPGRADE_ORDER[i])
                         elif i == 4:
                             self.state = GameState.MAIN_MENU
             
@@ -1320,7 +3158,7 @@ class Game:
                             self.state = GameState.MAIN_MENU
             
             elif self.state == GameState.ABOUT:
-                back_button = Button(WIDTH//2 - 150, 530, 300, 50, "Back to Command Center", BLUE, PURPLE)
+                back_button = self.about_buttons[0]
                 back_button.check_hover(mouse_pos)
                 if back_button.is_clicked(mouse_pos, mouse_click):
                     self.state = GameState.MAIN_MENU
@@ -1330,8 +3168,7 @@ class Game:
                     button.check_hover(mouse_pos)
                     if button.is_clicked(mouse_pos, mouse_click):
                         if i == 0:
-                            self.reset_game()
-                            self.state = GameState.PLAYING
+                            self.start_mission()
                         elif i == 1:
                             self.state = GameState.MAIN_MENU
             
@@ -1344,14 +3181,768 @@ class Game:
                         elif i == 1:
                             self.state = GameState.MAIN_MENU
             
-            self.update()
-            self.draw()
+            # Fixed-timestep simulation; leftover time becomes the render interpolation factor
+            inputs = InputState.from_keys(pygame.key.get_pressed())
+            self.profiler.lap("events")
+            now = time.perf_counter()
+            accumulator = min(accumulator + (now - previous) * 1000, MAX_TICKS_PER_FRAME * TICK_MS)
+            previous = now
+            while accumulator >= TICK_MS:
+                self.update(inputs)
+                accumulator -= TICK_MS
+            self.render_alpha = accumulator / TICK_MS if self.state == GameState.PLAYING else 1.0
             
-            pygame.display.flip()
-            self.clock.tick(60)
+            if self.recorder is not None and self.state in (GameState.GAME_OVER, GameState.MAIN_MENU):
+                self.finish_recording()
+            
+            # Gameplay and animated menus flip the whole frame; static screens push only what changed
+            dirty = self.compose_frame()
+            self.profiler.lap("draw.screen")
+            if self.show_profiler:
+                area = self.profiler.draw(screen)
+                if dirty is not None:
+                    dirty.append(area)
+                self.profiler.lap("draw.profiler")
+            present(dirty)
+            self.profiler.lap("present")
+            if quality.observe((time.perf_counter() - frame_start) * 1000):
+                # Glow and star changes alter what static screens show
+                self.static_key = None
+                if tracer is not None:
+                    tracer.instant(f"quality {quality.settings['name']}", "quality", {"tier": quality.tier})
+            if self.first_frame_ms is None:
+                # Startup is measured up to the first presented frame; the audio device opens after it
+                self.first_frame_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+                print(f"First frame presented {self.first_frame_ms:.0f} ms after startup")
+                self.sound_manager.init_mixer()
+            self.clock.tick(FRAME_RATE_CAP)
+            self.profiler.lap("idle")
+            self.profiler.end_frame(self.entity_counts(), self.reuse_rates())
+            
+            if tracer is not None:
+                # Frame spans, entity counters and state changes mark spikes such as level transitions
+                tracer.complete("frame", "frame", frame_start, time.perf_counter())
+                tracer.counters("entities", self.entity_counts())
+                if self.state != traced_state:
+                    traced_state = self.state
+                    tracer.instant(self.state.name, "state", {"level": self.level, "wave": self.wave})
+
+# Span tracer: Chrome Trace Event JSON for offline inspection in chrome://tracing or Perfetto.
+# The traced methods are only wrapped while a tracer is running, so a disabled tracer costs nothing.
+TRACED_METHODS = (
+    (Game, "update", "sim"),
+    (Game, "check_collisions", "sim"),
+    (Game, "spawn_enemy", "sim"),
+    (Game, "spawn_boss", "sim"),
+    (Enemy, "shoot", "sim"),
+    (Game, "draw", "render"),
+    (Game, "compose_frame", "render")
+)
+TRACE_CHUNK_EVENTS = 4096
+
+class SpanTracer:
+    def __init__(self, path, chunk_events=TRACE_CHUNK_EVENTS):
+        self.path = path
+        self.chunk_events = chunk_events
+        self.file = None
+        self.pending = []
+        self.originals = []
+        self.events = 0
+        self.chunks = 0
+        self.origin = 0.0
+
+    def start(self):
+        self.file = open(self.path, "w")
+        self.file.write("[\n")
+        self.origin = time.perf_counter()
+        self.emit('{"name":"process_name","ph":"M","pid":1,"tid":1,"args":{"name":"Galaxy Defender"}}')
+        self.emit('{"name":"thread_name","ph":"M","pid":1,"tid":1,"args":{"name":"main"}}')
+        for cls, name, category in TRACED_METHODS:
+            original = cls.__dict__[name]
+            self.originals.append((cls, name, original))
+            setattr(cls, name, self.wrap(original, f"{cls.__name__}.{name}", category))
+        return self
+
+    def stop(self):
+        for cls, name, original in reversed(self.originals):
+            setattr(cls, name, original)
+        self.originals.clear()
+        if self.file is not None:
+            self.flush()
+            self.file.write("\n]\n")
+            self.file.close()
+            self.file = None
+
+    def wrap(self, function, span, category):
+        complete = self.complete
+        def traced(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                complete(span, category, start, time.perf_counter())
+        traced.__name__ = function.__name__
+        traced.__wrapped__ = function
+        return traced
+
+    def emit(self, event):
+        self.pending.append(event)
+        self.events += 1
+        if len(self.pending) >= self.chunk_events:
+            self.flush()
+
+    def flush(self):
+        # Events go to disk in chunks, so a long session never holds the whole trace in memory
+        if self.pending and self.file is not None:
+            if self.chunks:
+                self.file.write(",\n")
+            self.file.write(",\n".join(self.pending))
+            self.pending.clear()
+            self.chunks += 1
+
+    def complete(self, name, category, start, end):
+        self.emit(f'{{"name":"{name}","cat":"{category}","ph":"X","ts":{(start - self.origin) * 1e6:.3f},'
+                  f'"dur":{(end - start) * 1e6:.3f},"pid":1,"tid":1}}')
+
+    def instant(self, name, category, args=None):
+        ts = (time.perf_counter() - self.origin) * 1e6
+        self.emit(f'{{"name":"{name}","cat":"{category}","ph":"i","s":"g","ts":{ts:.3f},"pid":1,"tid":1,'
+                  f'"args":{json.dumps(args or {})}}}')
+
+    def counters(self, name, values):
+        ts = (time.perf_counter() - self.origin) * 1e6
+        self.emit(f'{{"name":"{name}","ph":"C","ts":{ts:.3f},"pid":1,"tid":1,"args":{json.dumps(values)}}}')
+
+# Pilots: headless input policies for batch runs. Each is called once per tick with the game.
+FIRE_ONLY = InputState(fire=True)
+FIRE_LEFT = InputState(left=True, fire=True)
+FIRE_RIGHT = InputState(right=True, fire=True)
+PILOT_DODGE_WIDTH = 40
+PILOT_DODGE_HEIGHT = 150
+PILOT_AIM_SLACK = 8
+PILOT_SWEEP_TICKS = 40
+
+class HeuristicPilot:
+    # Fires nonstop, sidesteps shots and hulls bearing down on the ship, otherwise lines up under the lowest enemy
+    def __call__(self, game):
+        player = game.player
+        px, py = player.x, player.y
+        for archetype in (game.enemy_bullets, game.enemies):
+            n = archetype.count
+            if n:
+                xs = archetype.pos[:n, 0]
+                ys = archetype.pos[:n, 1]
+                near = ((np.abs(xs - px) < PILOT_DODGE_WIDTH + archetype.radius[:n])
+                        & (ys > py - PILOT_DODGE_HEIGHT) & (ys < py + player.height))
+                if near.any():
+                    go_left = xs[near].mean() >= px
+                    # Pinned against a wall, the only way out is back past the threat
+                    if go_left and px <= player.width:
+                        go_left = False
+                    elif not go_left and px >= WIDTH - player.width:
+                        go_left = True
+                    return FIRE_LEFT if go_left else FIRE_RIGHT
+        
+        enemies = game.enemies
+        if enemies.count:
+            target = enemies.pos[int(np.argmax(enemies.pos[:enemies.count, 1])), 0]
+            if target < px - PILOT_AIM_SLACK:
+                return FIRE_LEFT
+            if target > px + PILOT_AIM_SLACK:
+                return FIRE_RIGHT
+        return FIRE_ONLY
+
+class SweepPilot:
+    # Scripted baseline: fires while sweeping from side to side
+    def __call__(self, game):
+        return FIRE_LEFT if (game.tick // PILOT_SWEEP_TICKS) % 2 else FIRE_RIGHT
+
+PILOTS = {
+    "heuristic": HeuristicPilot,
+    "sweep": SweepPilot
+}
+
+# Batch simulation: headless missions spread over a process pool for balance sweeps.
+# Results stream to a columnar file: a JSON schema, then zlib-compressed column chunks.
+BATCH_MAGIC = b"GDBS"
+BATCH_VERSION = 1
+BATCH_HEADER = struct.Struct("<4sHI")
+BATCH_CHUNK = struct.Struct("<II")
+BATCH_CHUNK_ROWS = 256
+BATCH_MAX_TICKS = 10 * 60 * TICK_RATE
+BATCH_COLUMNS = (
+    ("config", "<u4"),
+    ("seed", "<u8"),
+    ("ticks", "<u4"),
+    ("level", "<u2"),
+    ("kills", "<u4"),
+    ("credits", "<u4"),
+    ("score", "<u4"),
+    ("bosses", "<u2"),
+    ("first_boss_kill_tick", "<i4"),
+    ("upgrades_affordable", "<u2"),
+    ("survived", "u1")
+)
+
+def affordable_upgrades(balance, credits):
+    # Shop purchases the credits would cover, always buying the cheapest next level
+    levels = dict.fromkeys(balance.upgrade_prices, 1)
+    bought = 0
+    while True:
+        upgrade = min(levels, key=lambda name: balance.upgrade_price(name, levels[name]))
+        price = balance.upgrade_price(upgrade, levels[upgrade])
+        if price <= 0 or price > credits:
+            return bought
+        credits -= price
+        levels[upgrade] += 1
+        bought += 1
+
+def simulate_run(task):
+    # One headless mission; it runs in a pool worker, so all of its inputs travel in the task tuple
+    config, overrides, seed, pilot, max_ticks, budgets = task
+    game = Game(balance=Balance(**overrides), budgets=budgets)
+    game.start_mission(seed)
+    ticks = game.simulate(max_ticks, PILOTS[pilot]())
+    player = game.player
+    return (config, seed, ticks, game.level, player.kill_count, player.money, game.score,
+            len(game.boss_kill_ticks), game.boss_kill_ticks[0] if game.boss_kill_ticks else -1,
+            affordable_upgrades(game.balance, player.money), game.state != GameState.GAME_OVER)
+
+class BatchWriter:
+    def __init__(self, path, schema, chunk_rows=BATCH_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+        self.rows = []
+        self.written = 0
+        schema = json.dumps(schema).encode()
+        self.file = open(path, "wb")
+        self.file.write(BATCH_HEADER.pack(BATCH_MAGIC, BATCH_VERSION, len(schema)))
+        self.file.write(schema)
+
+    def append(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            columns = zip(*self.rows)
+            payload = b"".join(np.array(values, dtype).tobytes() for values, (_, dtype) in zip(columns, BATCH_COLUMNS))
+            payload = zlib.compress(payload)
+            self.file.write(BATCH_CHUNK.pack(len(self.rows), len(payload)))
+            self.file.write(payload)
+            self.written += len(self.rows)
+            self.rows.clear()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+def load_batch(path):
+    # Returns (schema, {column: array}) for a batch results file
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, schema_size = BATCH_HEADER.unpack_from(data)
+    if magic != BATCH_MAGIC or version != BATCH_VERSION:
+        raise ValueError(f"{path} is not a version {BATCH_VERSION} batch file")
+    offset = BATCH_HEADER.size
+    schema = json.loads(data[offset:offset + schema_size])
+    offset += schema_size
+    chunks = {name: [] for name, _ in BATCH_COLUMNS}
+    while offset < len(data):
+        rows, size = BATCH_CHUNK.unpack_from(data, offset)
+        offset += BATCH_CHUNK.size
+        payload = zlib.decompress(data[offset:offset + size])
+        offset += size
+        start = 0
+        for name, dtype in BATCH_COLUMNS:
+            column = np.frombuffer(payload, dtype, rows, start)
+            chunks[name].append(column)
+            start += column.nbytes
+    return schema, {name: np.concatenate(parts) if parts else np.zeros(0, dtype)
+                    for (name, dtype), parts in zip(BATCH_COLUMNS, chunks.values())}
+
+def summarize_batch(schema, columns):
+    summary = []
+    for config, settings in enumerate(schema["configs"]):
+        rows = columns["config"] == config
+        boss_ticks = columns["first_boss_kill_tick"][rows]
+        boss_ticks = boss_ticks[boss_ticks >= 0]
+        runs = int(rows.sum())
+        summary.append({
+            "config": config,
+            "settings": settings,
+            "runs": runs,
+            "survival_rate": float(columns["survived"][rows].mean()) if runs else 0.0,
+            "mean_level": float(columns["level"][rows].mean()) if runs else 0.0,
+            "mean_kills": float(columns["kills"][rows].mean()) if runs else 0.0,
+            "mean_credits": float(columns["credits"][rows].mean()) if runs else 0.0,
+            "mean_upgrades_affordable": float(columns["upgrades_affordable"][rows].mean()) if runs else 0.0,
+            "boss_kill_rate": len(boss_ticks) / runs if runs else 0.0,
+            "median_boss_kill_seconds": float(np.median(boss_ticks)) / TICK_RATE if len(boss_ticks) else None
+        })
+    return summary
+
+def run_batch(path, configs=({},), runs=16, pilot="heuristic", max_ticks=BATCH_MAX_TICKS, processes=None, base_seed=0,
+              budgets=None):
+    # Every configuration plays the same mission seeds, so differences between them come from the settings
+    balances = [Balance(**overrides) for overrides in configs]
+    if pilot not in PILOTS:
+        raise ValueError(f"unknown pilot {pilot!r}; choose from {', '.join(PILOTS)}")
+    budgets = dict(ENTITY_BUDGETS, **(budgets or {}))
+    tasks = [(config, overrides, base_seed + run, pilot, max_ticks, budgets)
+             for config, overrides in enumerate(configs) for run in range(runs)]
+    schema = {
+        "columns": BATCH_COLUMNS,
+        "configs": [balance.to_dict() for balance in balances],
+        "pilot": pilot,
+        "max_ticks": max_ticks,
+        "base_seed": base_seed,
+        "budgets": budgets
+    }
+    workers = processes or os.cpu_count() or 1
+    writer = BatchWriter(path, schema)
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            for row in pool.imap_unordered(simulate_run, tasks, chunksize=max(1, len(tasks) // (8 * workers))):
+                writer.append(row)
+    finally:
+        writer.close()
+    return summarize_batch(*load_batch(path))
+
+# Environment API: step/reset over headless games for agents and automated playtests.
+# Actions are input masks (0-31, see InputState.mask); nothing here touches the display.
+ENV_ACTIONS = len(INPUT_STATES)
+ENV_NEAREST_ENEMIES = 5
+ENV_GRID_COLS = 16
+ENV_GRID_ROWS = 12
+ENV_FRAME_SKIP = 1
+ENV_SCORE_REWARD = 0.01
+ENV_DAMAGE_PENALTY = 0.01
+ENV_LIFE_PENALTY = 1.0
+ENV_OBSERVATION_SHAPES = {
+    # x, y, health, shield, lives, invincible
+    "player": (6,),
+    # dx, dy, speed, health, present; nearest first
+    "enemies": (ENV_NEAREST_ENEMIES, 5),
+    # projectile counts per cell: enemy shots, then player shots
+    "projectiles": (2, ENV_GRID_ROWS, ENV_GRID_COLS)
+}
+
+def observe_games(games):
+    # Batched observations, one leading row per game
+    k = len(games)
+    players = np.array([(p.x / WIDTH, p.y / HEIGHT, p.health / p.max_health, p.shield / 50, p.lives, p.invincible > 0)
+                        for p in (game.player for game in games)], np.float32).reshape(k, 6)
+    
+    enemies = np.zeros((k, ENV_NEAREST_ENEMIES, 5), np.float32)
+    for i, game in enumerate(games):
+        archetype = game.enemies
+        n = archetype.count
+        if n:
+            player = game.player
+            offsets = archetype.pos[:n] - (player.x, player.y)
+            order = np.argsort(np.einsum("ij,ij->i", offsets, offsets))[:ENV_NEAREST_ENEMIES]
+            m = len(order)
+            enemies[i, :m, :2] = offsets[order] / (WIDTH, HEIGHT)
+            enemies[i, :m, 2] = archetype.vel[order, 1]
+            enemies[i, :m, 3] = archetype.health[order]
+            enemies[i, :m, 4] = 1
+    
+    # Every projectile of every game is binned with a single bincount
+    positions = []
+    counts = []
+    for game in games:
+        for archetype in (game.enemy_bullets, game.bullets):
+            positions.append(archetype.pos[:archetype.count])
+            counts.append(archetype.count)
+    cells = ENV_GRID_ROWS * ENV_GRID_COLS
+    positions = np.concatenate(positions)
+    cols = np.clip((positions[:, 0] * (ENV_GRID_COLS / WIDTH)).astype(np.intp), 0, ENV_GRID_COLS - 1)
+    rows = np.clip((positions[:, 1] * (ENV_GRID_ROWS / HEIGHT)).astype(np.intp), 0, ENV_GRID_ROWS - 1)
+    slots = np.repeat(np.arange(2 * k) * cells, counts) + rows * ENV_GRID_COLS + cols
+    projectiles = np.bincount(slots, minlength=2 * k * cells).astype(np.float32)
+    
+    return {
+        "player": players,
+        "enemies": enemies,
+        "projectiles": projectiles.reshape(k, 2, ENV_GRID_ROWS, ENV_GRID_COLS)
+    }
+
+class VectorGameEnv:
+    # K independent games stepped in lockstep. With auto_reset, finished games restart on the
+    # spot, so the observation returned with done=True already belongs to the next mission.
+    def __init__(self, num_envs, seed=0, balance=DEFAULT_BALANCE, frame_skip=ENV_FRAME_SKIP, max_ticks=BATCH_MAX_TICKS,
+                 auto_reset=True):
+        self.games = [Game(seed=None if seed is None else seed + i, balance=balance) for i in range(num_envs)]
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.auto_reset = auto_reset
+        self.scores = np.zeros(num_envs)
+        self.hit_points = np.zeros(num_envs)
+        self.lives = np.zeros(num_envs)
+
+    def __len__(self):
+        return len(self.games)
+
+    def vitals(self):
+        players = [game.player for game in self.games]
+        return (np.array([game.score for game in self.games], np.float64),
+                np.array([(p.lives - 1) * p.max_health + p.health + p.shield for p in players], np.float64),
+                np.array([p.lives for p in players], np.float64))
+
+    def reset_game(self, i, seed=None):
+        game = self.games[i]
+        game.start_mission(seed)
+        player = game.player
+        self.scores[i] = game.score
+        self.hit_points[i] = (player.lives - 1) * player.max_health + player.health + player.shield
+        self.lives[i] = player.lives
+
+    def reset(self, seeds=None):
+        for i in range(len(self.games)):
+            self.reset_game(i, seeds[i] if seeds is not None else None)
+        return observe_games(self.games)
+
+    def step(self, actions):
+        # Returns (observations, rewards, dones, infos)
+        frame_skip = self.frame_skip
+        for game, action in zip(self.games, np.asarray(actions).tolist()):
+            inputs = INPUT_STATES[action]
+            for _ in range(frame_skip):
+                game.update(inputs)
+                if game.state == GameState.GAME_OVER:
+                    break
+        
+        scores, hit_points, lives = self.vitals()
+        rewards = ((scores - self.scores) * ENV_SCORE_REWARD
+                   - np.maximum(self.hit_points - hit_points, 0) * ENV_DAMAGE_PENALTY
+                   - np.maximum(self.lives - lives, 0) * ENV_LIFE_PENALTY)
+        self.scores, self.hit_points, self.lives = scores, hit_points, lives
+        
+        over = np.array([game.state == GameState.GAME_OVER for game in self.games])
+        truncated = np.array([game.tick >= self.max_ticks for game in self.games]) & ~over
+        dones = over | truncated
+        infos = [{"score": game.score, "level": game.level, "tick": game.tick, "truncated": bool(cut)}
+                 for game, cut in zip(self.games, truncated.tolist())]
+        if self.auto_reset:
+            for i in np.flatnonzero(dones).tolist():
+                self.reset_game(i)
+        return observe_games(self.games), rewards.astype(np.float32), dones, infos
+
+def env_worker(connection, num_envs, seed, balance, frame_skip, max_ticks):
+    envs = VectorGameEnv(num_envs, seed, balance, frame_skip, max_ticks)
+    while True:
+        command, payload = connection.recv()
+        if command == "step":
+            connection.send(envs.step(payload))
+        elif command == "reset":
+            connection.send(envs.reset(payload))
+        else:
+            break
+    connection.close()
+
+class ParallelGameEnv:
+    # A VectorGameEnv sharded over worker processes: same interface, same batched layout
+    def __init__(self, num_envs, processes=None, seed=0, balance=DEFAULT_BALANCE, frame_skip=ENV_FRAME_SKIP,
+                 max_ticks=BATCH_MAX_TICKS):
+        workers = max(1, min(num_envs, processes or os.cpu_count() or 1))
+        self.bounds = np.linspace(0, num_envs, workers + 1).astype(int).tolist()
+        self.connections = []
+        self.workers = []
+        for start, stop in zip(self.bounds[:-1], self.bounds[1:]):
+            parent, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=env_worker, daemon=True, args=(
+                child, stop - start, None if seed is None else seed + start, balance, frame_skip, max_ticks))
+            worker.start()
+            child.close()
+            self.connections.append(parent)
+            self.workers.append(worker)
+
+    def __len__(self):
+        return self.bounds[-1]
+
+    def gather(self):
+        return [connection.recv() for connection in self.connections]
+
+    def reset(self, seeds=None):
+        for connection, start, stop in zip(self.connections, self.bounds[:-1], self.bounds[1:]):
+            connection.send(("reset", seeds[start:stop] if seeds is not None else None))
+        shards = self.gather()
+        return {name: np.concatenate([shard[name] for shard in shards]) for name in ENV_OBSERVATION_SHAPES}
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        for connection, start, stop in zip(self.connections, self.bounds[:-1], self.bounds[1:]):
+            connection.send(("step", actions[start:stop]))
+        shards = self.gather()
+        observations = {name: np.concatenate([shard[0][name] for shard in shards]) for name in ENV_OBSERVATION_SHAPES}
+        return (observations, np.concatenate([shard[1] for shard in shards]),
+                np.concatenate([shard[2] for shard in shards]), [info for shard in shards for info in shard[3]])
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        self.connections.clear()
+        self.workers.clear()
+
+class GameEnv:
+    # Single-game step/reset interface; observations drop the leading batch axis
+    def __init__(self, seed=None, balance=DEFAULT_BALANCE, frame_skip=ENV_FRAME_SKIP, max_ticks=BATCH_MAX_TICKS):
+        self.envs = VectorGameEnv(1, seed, balance, frame_skip, max_ticks, auto_reset=False)
+        self.game = self.envs.games[0]
+
+    def reset(self, seed=None):
+        observations = self.envs.reset([seed])
+        return {name: values[0] for name, values in observations.items()}
+
+    def step(self, action):
+        # Returns (observation, reward, done, info); call reset() once done
+        observations, rewards, dones, infos = self.envs.step((action,))
+        return {name: values[0] for name, values in observations.items()}, float(rewards[0]), bool(dones[0]), infos[0]
+
+# Benchmark suite: scripted stress scenarios with separate update and draw timings
+BENCHMARK_VERSION = 5
+BENCHMARK_HELL_RING = tuple(range(0, 360, 5))
+# Scenarios measure full load, so the enemy bullet cap sits well above the bullet hell's peak of about 9k
+BENCHMARK_BUDGETS = {"enemy_bullets": 16384}
+
+class Benchmark:
+    def __init__(self, seed=1, budgets=None):
+        self.seed = seed
+        self.budgets = dict(BENCHMARK_BUDGETS, **(budgets or {}))
+        self.scenarios = {
+            "wave_level10_triple": (600, self.setup_wave_triple, self.step_wave, None),
+            "wave_level10_spread": (600, self.setup_wave_spread, self.step_wave, None),
+            "boss_ring_storm": (600, self.setup_boss_storm, self.step_boss_storm, None),
+            "boss_bullet_hell": (600, self.setup_boss_storm, self.step_bullet_hell, None),
+            "particle_burst_5k": (300, self.setup_particle_burst, self.step_particle_burst, None),
+            "menu_background": (300, self.setup_menu, None, lambda game: game.draw_beautiful_menu_background),
+            "upgrade_shop_hover": (300, self.setup_upgrade_shop, self.step_upgrade_shop, lambda game: game.compose_frame)
+        }
+
+    def setup_wave(self, game, weapon_type):
+        game.start_mission(self.seed)
+        game.level = 10
+        game.wave_size = 40
+        game.enemies_needed_for_boss = 10**9
+        game.player.lives = 10**9
+        game.player.weapon_type = weapon_type
+        game.player.upgrades["fire_rate"] = 8
+        for _ in range(20):
+            game.spawn_enemy()
+
+    def setup_wave_triple(self, game):
+        self.setup_wave(game, WeaponType.TRIPLE)
+
+    def setup_wave_spread(self, game):
+        self.setup_wave(game, WeaponType.SPREAD)
+
+    def step_wave(self, game, frame):
+        # Sweep across the screen with the trigger held
+        return InputState(left=(frame // 90) % 2 == 1, right=(frame // 90) % 2 == 0, fire=True)
+
+    def setup_boss_storm(self, game):
+        game.start_mission(self.seed)
+        game.level = 9
+        game.player.lives = 10**9
+        game.spawn_boss()
+        self.boss = game.enemies.objects[-1]
+        self.boss.y = 120
+        self.boss.shoot_chance = 1.0
+
+    def step_boss_storm(self, game, frame):
+        # Pin the boss in ring-fire pattern 2 and let it fire every tick
+        boss = self.boss
+        boss.attack_pattern = 2
+        boss.attack_timer = 0
+        boss.movement_timer = 0
+        boss.last_shot = -10**9
+        game.player.invincible = 2
+        return NO_INPUT
+
+    def step_bullet_hell(self, game, frame):
+        # On top of the ring storm, a 72-way ring every tick keeps several thousand bullets alive
+        boss = self.boss
+        game.enemy_bullets.fire(boss.x, boss.y + boss.height//2, BENCHMARK_HELL_RING)
+        return self.step_boss_storm(game, frame)
+
+    def setup_particle_burst(self, game):
+        game.start_mission(self.seed)
+        game.boss_active = True
+        game.particles.emit(WIDTH//2, HEIGHT//2, RED, 2500, life=(200, 300))
+        game.particles.emit(WIDTH//2, HEIGHT//2, YELLOW, 2500, life=(200, 300))
+
+    def step_particle_burst(self, game, frame):
+        game.player.invincible = 2
+        return NO_INPUT
+
+    def setup_menu(self, game):
+        game.state = GameState.MAIN_MENU
+
+    def setup_upgrade_shop(self, game):
+        game.state = GameState.UPGRADE_SHOP
+
+    def step_upgrade_shop(self, game, frame):
+        # Move the pointer to the next button every half second so some frames repaint a hover change;
+        # every few frames the backdrop refreshes in full
+        pointer = (WIDTH//2, 230 + (frame // 30 % 5) * 80)
+        for button in game.upgrade_buttons:
+            button.check_hover(pointer)
+        return NO_INPUT
+
+    def run_scenario(self, name):
+        frames, setup, step, draw_phase = self.scenarios[name]
+        game = Game(seed=self.seed, budgets=self.budgets)
+        setup(game)
+        draw = draw_phase(game) if draw_phase else game.draw
+        
+        collections = [0, 0, 0]
+        def count_collections(phase, info):
+            if phase == "start":
+                collections[info["generation"]] += 1
+        
+        update_times = np.zeros(frames)
+        draw_times = np.zeros(frames)
+        perf_counter = time.perf_counter
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        gc.callbacks.append(count_collections)
+        try:
+            for frame in range(frames):
+                inputs = step(game, frame) if step else NO_INPUT
+                start = perf_counter()
+                game.update(inputs)
+                middle = perf_counter()
+                draw()
+                end = perf_counter()
+                update_times[frame] = middle - start
+                draw_times[frame] = end - middle
+        finally:
+            gc.callbacks.remove(count_collections)
+        blocks_after = sys.getallocatedblocks()
+        
+        def summary(samples):
+            ms = samples * 1000
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            return {"mean": round(float(ms.mean()), 4), "p50": round(float(p50), 4),
+                    "p95": round(float(p95), 4), "p99": round(float(p99), 4), "max": round(float(ms.max()), 4)}
+        
+        return {
+            "frames": frames,
+            "update_ms": summary(update_times),
+            "draw_ms": summary(draw_times),
+            "frame_ms": summary(update_times + draw_times),
+            "ticks_per_sec": round(frames / float(update_times.sum()), 1),
+            "frames_per_sec": round(frames / float((update_times + draw_times).sum()), 1),
+            "allocations": {
+                "gc_collections": collections,
+                "net_blocks": blocks_after - blocks_before
+            },
+            "entities": game.entity_stats()
+        }
+
+    def run(self, names=None):
+        names = names or list(self.scenarios)
+        return {
+            "version": BENCHMARK_VERSION,
+            "python": sys.version.split()[0],
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "seed": self.seed,
+            "scenarios": {name: self.run_scenario(name) for name in names}
+        }
 
 if __name__ == "__main__":
-    game = Game()
+    import argparse
+    parser = argparse.ArgumentParser(description="Galaxy Defender - Ultimate Space Shooter")
+    parser.add_argument("--seed", type=int, help="seed for the mission sequence")
+    parser.add_argument("--record", metavar="PATH", help="record each mission's input to a replay file; later missions add -2, -3, ... to the name")
+    parser.add_argument("--replay", metavar="PATH", help="re-simulate a replay headless and verify it")
+    parser.add_argument("--bench", metavar="PATH", help="run the benchmark suite and write a JSON report to PATH")
+    parser.add_argument("--bench-scenarios", metavar="NAMES", help="comma-separated subset of benchmark scenarios")
+    parser.add_argument("--offscreen", action="store_true", help="benchmark draws into an offscreen surface instead of a window")
+    parser.add_argument("--batch", metavar="PATH", help="run headless balance simulations and write columnar results to PATH")
+    parser.add_argument("--batch-configs", metavar="PATH", help="JSON list of balance overrides, one configuration each")
+    parser.add_argument("--batch-runs", type=int, default=16, help="missions per configuration")
+    parser.add_argument("--pilot", default="heuristic", choices=sorted(PILOTS), help="input policy for batch missions")
+    parser.add_argument("--max-ticks", type=int, default=BATCH_MAX_TICKS, help="tick limit per batch mission")
+    parser.add_argument("--processes", type=int, help="worker processes for batch runs (default: all cores)")
+    parser.add_argument("--window", metavar="WxH", help="initial window size; the game is scaled to fit")
+    parser.add_argument("--fullscreen", action="store_true", help="start fullscreen (F11 toggles)")
+    parser.add_argument("--scaling", default="nearest", choices=SCALE_MODES, help="filter used to scale the game to the window")
+    parser.add_argument("--quality", default="auto", choices=["auto"] + [tier["name"] for tier in QUALITY_TIERS],
+                        help="fix the detail tier instead of adapting it to frame time")
+    parser.add_argument("--save", metavar="PATH", help="file F5 saves the mission to and F9 loads it from")
+    parser.add_argument("--load", metavar="PATH", help="resume the mission saved in a snapshot file")
+    parser.add_argument("--budget", metavar="NAME=N", action="append", default=[],
+                        help=f"cap an entity category ({', '.join(ENTITY_BUDGETS)}); may be repeated; saved in replays and snapshots")
+    parser.add_argument("--trace", metavar="PATH", help="write Chrome Trace Event JSON spans to PATH while playing")
+    parser.add_argument("--profile", metavar="PATH", help="record per-frame phase timings and write them to PATH (.csv or .json) on exit")
+    args = parser.parse_args()
+    budgets = {}
+    for budget in args.budget:
+        name, _, limit = budget.partition("=")
+        if name not in ENTITY_BUDGETS or not limit.isdigit() or not 1 <= int(limit) < 2**32:
+            parser.error(f"invalid budget {budget!r}")
+        budgets[name] = int(limit)
+    
+    if args.bench:
+        if args.offscreen:
+            create_offscreen_display()
+        else:
+            create_display()
+        benchmark = Benchmark(seed=args.seed if args.seed is not None else 1, budgets=budgets)
+        names = args.bench_scenarios.split(",") if args.bench_scenarios else None
+        with open(args.bench, "w") as f:
+            json.dump(benchmark.run(names), f, indent=2, sort_keys=True)
+            f.write("\n")
+        pygame.quit()
+        sys.exit()
+    
+    if args.batch:
+        configs = [{}]
+        if args.batch_configs:
+            with open(args.batch_configs) as f:
+                configs = json.load(f)
+        start = time.perf_counter()
+        summary = run_batch(args.batch, configs, args.batch_runs, args.pilot, args.max_ticks, args.processes,
+                            args.seed if args.seed is not None else 0, budgets)
+        print(f"Simulated {len(configs) * args.batch_runs} missions in {time.perf_counter() - start:.1f}s")
+        for row in summary:
+            boss = row["median_boss_kill_seconds"]
+            print(f"config {row['config']}: survival {row['survival_rate']:.0%}, level {row['mean_level']:.2f}, "
+                  f"kills {row['mean_kills']:.1f}, credits {row['mean_credits']:.0f}, "
+                  f"boss kills {row['boss_kill_rate']:.0%}" + (f" (median {boss:.0f}s)" if boss is not None else ""))
+        sys.exit()
+    
+    if args.replay:
+        replay = Replay.load(args.replay)
+        game = Game()
+        start = time.perf_counter()
+        ticks, matched = replay.play(game)
+        elapsed = time.perf_counter() - start
+        print(f"Replayed {ticks}/{len(replay.masks)} ticks in {elapsed:.2f}s "
+              f"({ticks / max(elapsed, 1e-9):.0f} ticks/s, {ticks / max(elapsed, 1e-9) / TICK_RATE:.0f}x real time)")
+        print(f"Final state: level {game.level}, score {game.score}, {'MATCH' if matched else 'MISMATCH'}")
+        sys.exit(0 if matched else 1)
+    
+    game = Game(seed=args.seed, budgets=budgets)
+    game.record_path = args.record
+    game.profile_path = args.profile
+    game.save_path = args.save
+    if args.load:
+        with open(args.load, "rb") as f:
+            game.restore(f.read())
+    if args.window:
+        game.windowed_size = tuple(int(n) for n in args.window.lower().split("x"))
+    game.fullscreen = args.fullscreen
+    if args.quality != "auto":
+        quality.pin([tier["name"] for tier in QUALITY_TIERS].index(args.quality))
+    game.scaling = args.scaling
+    game.trace_path = args.trace
     game.run()
     pygame.quit()
     sys.exit()
\ No newline at end of file